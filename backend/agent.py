@@ -5,6 +5,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from llama_cpp import Llama
 from backend.tools import predict_placement, get_placement_advice, analyze_improvement_scenarios
+from backend.metrics import AGENT_SECONDS, timed
 
 # -----------------------------
 # Load LLaMA model safely
@@ -17,6 +18,7 @@ except Exception as e:
     llm = None
 
 
+@timed(AGENT_SECONDS, label_from_result=("branch", lambda response: response.get("type")))
 def create_agent(user_input: str, df: pd.DataFrame = None):
     """Main agent function. Handles placement, dataset Q&A, plots, or fallback chat."""
 
@@ -68,9 +70,10 @@ def create_agent(user_input: str, df: pd.DataFrame = None):
             if len(numbers) >= 2:
                 cgpa = float(numbers[0])
                 iq = float(numbers[1])
-                result, _, _ = predict_placement(cgpa, iq)
-                advice = get_placement_advice(cgpa, iq, result)
+                # All variants, including the current profile, are scored in one batch
                 scenarios = analyze_improvement_scenarios(cgpa, iq)
+                result = scenarios["current"][0]
+                advice = get_placement_advice(cgpa, iq, result)
                 return {
                     "type": "advice",
                     "response": advice,
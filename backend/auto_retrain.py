@@ -1,15 +1,72 @@
 import pandas as pd
 import numpy as np
-import joblib
 import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, accuracy_score, roc_auc_score
+import copy
+import functools
 import json
 
+try:
+    from backend.dataset_io import (
+        COLUMN_DTYPES, append_dataset, columnar_parts, dataset_format, dataset_stamp, is_columnar,
+        is_segmented, iter_dataset_chunks, list_shard_paths, read_dataset, write_dataset
+    )
+    from backend.dedupe_index import KeyIndex, META_FILE as INDEX_META_FILE
+    from backend.segment_store import SegmentStore
+    from backend.probability_grid import build_probability_grid
+    from backend.model_registry import ModelRegistry, dataset_fingerprint
+    from backend.model_artifact import load_artifact, save_artifact
+    from backend.model_search import SEARCH_SPACES, successive_halving
+    from backend.sampling import stratified_reservoir_sample
+    from backend.out_of_core import MappedDataset, fit_out_of_core_logistic
+    from backend.validation import validate_file
+    from backend.file_lock import FileLock
+    from backend import metrics
+    from backend.metrics import RETRAIN_STAGE_SECONDS, timed
+except ImportError:  # run as a script from inside backend/
+    from dataset_io import (
+        COLUMN_DTYPES, append_dataset, columnar_parts, dataset_format, dataset_stamp, is_columnar,
+        is_segmented, iter_dataset_chunks, list_shard_paths, read_dataset, write_dataset
+    )
+    from dedupe_index import KeyIndex, META_FILE as INDEX_META_FILE
+    from segment_store import SegmentStore
+    from probability_grid import build_probability_grid
+    from model_registry import ModelRegistry, dataset_fingerprint
+    from model_artifact import load_artifact, save_artifact
+    from model_search import SEARCH_SPACES, successive_halving
+    from sampling import stratified_reservoir_sample
+    from out_of_core import MappedDataset, fit_out_of_core_logistic
+    from validation import validate_file
+    from file_lock import FileLock
+    import metrics
+    from metrics import RETRAIN_STAGE_SECONDS, timed
+
+# train_models candidate name per estimator type, for artifacts saved
+# without a model_name (e.g. by generate_dataset.train_initial_model)
+WARM_START_FAMILIES = {
+    LogisticRegression: 'logistic',
+    RandomForestClassifier: 'random_forest',
+    GradientBoostingClassifier: 'gradient_boost',
+}
+
+
+def _exclusive(method):
+    """Run a retraining method under the cross-process retrain lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.retrain_lock():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class AutoRetrainer:
     """
@@ -29,6 +86,39 @@ class AutoRetrainer:
             'test_size': 0.2,
             'min_accuracy_threshold': 0.75,  # Don't deploy if accuracy drops below this
             'backup_old_model': True,
+            'registry_dir': None,  # Publish to a versioned model registry instead of model_save_path
+            'registry_keep_versions': 5,
+            'artifact_format': 'pickle',  # 'mmap' shares model arrays across serving processes
+            'training_sample_size': None,  # Train on a stratified sample of this many rows (None = all)
+            'training_sample_half_life': None,  # Rows; favour recent records in the sample (None = uniform)
+            'out_of_core_logistic': False,  # Fit the logistic candidate on the full memory-mapped dataset
+            'out_of_core_epochs': 3,
+            'out_of_core_block_rows': 262144,  # Rows read per block
+            'train_workers': None,  # CPU budget for train_models; None uses every core, 1 is sequential
+            'hyperparameter_search': False,  # Successive-halving search before the final fits
+            'search_budget_seconds': 600,  # Wall-clock budget shared by all candidates' searches
+            'search_min_samples': 2000,  # Training rows in the first rung
+            'search_reduction_factor': 3,  # Keep 1/factor of the configurations per rung
+            'search_max_configs': 30,  # Per candidate, sampled at random from larger spaces
+            'search_spaces': None,  # Per-candidate parameter lists; default: model_search.SEARCH_SPACES
+            'dedupe_index_path': None,  # (cgpa, iq) index for append_new_data; default: beside the base dataset
+            'reject_invalid_rows': False,  # retrain(): set invalid new rows aside instead of failing the batch
+            'ingest_batch_rows': 1000000,  # Valid rows buffered per append during streaming ingestion
+            'ingest_workers': None,  # Validation processes; None decides by file size
+            'compact_small_segment_rows': 100000,  # Segmented base: segments below this are merged
+            'compact_min_segments': 8,  # ...once at least this many are waiting
+            'warm_start': False,  # retrain() extends the deployed model instead of fitting from scratch
+            'warm_start_extra_estimators': 20,  # Trees (random forest) or stages (gradient boosting) added
+            'warm_start_max_estimators': 500,  # Cold retrain once a warm-started ensemble reaches this
+            'incremental_full_refit_every': 20,  # Incremental updates between safety-net full refits
+            'incremental_updates_since_refit': 0,
+            'incremental_holdout_rows': 20000,  # Refit holdout kept in the artifact to gate incremental updates
+            'retrain_interval_days': 30,  # Scheduled retrain once the model is this old
+            'retrain_min_new_samples': 1000,  # ...or once this many new samples have arrived
+            'scheduler_poll_seconds': 60,  # How often retrain_scheduler checks the thresholds
+            'scheduler_nice': 10,  # Added niceness of the scheduler process (lower CPU priority)
+            'rows_at_last_train': None,  # Live rows in the base dataset at the last scheduled retrain
+            'last_retrain_attempt': None,
             'last_train_date': None,
             'total_samples_trained': 0,
             'model_version': 1
@@ -50,12 +140,222 @@ class AutoRetrainer:
         with open(self.config_path, 'w') as f:
             json.dump(self.config, f, indent=2)
     
+    @timed(RETRAIN_STAGE_SECONDS, stage='load', model='')
     def load_base_dataset(self):
-        """Load the base training dataset."""
+        """
+        Load the base training dataset.
+        
+        base_dataset_path may be a CSV, a columnar directory (memory-mapped,
+        no parsing), a directory of part files or a segmented store, read as
+        one dataset. Rows replaced by later records through append_new_data
+        are dropped.
+        
+        For a segmented store the result is a consistent snapshot: the
+        segment list and superseded rows are read together under the
+        writer lock, then the immutable segments are read while ingestion
+        carries on.
+        """
         if not os.path.exists(self.base_dataset_path):
             raise FileNotFoundError(f"Base dataset not found: {self.base_dataset_path}")
-        return pd.read_csv(self.base_dataset_path)
+        
+        if is_segmented(self.base_dataset_path):
+            store = SegmentStore(self.base_dataset_path)
+            with store.lock():
+                manifest = store.manifest()
+                superseded = self._superseded_rows()
+            df = store.read(manifest)
+        else:
+            # Under the writer lock, so the rows and superseded positions
+            # agree and the index is never rebuilt under a running append
+            with self.writer_lock():
+                df = read_dataset(self.base_dataset_path)
+                superseded = self._superseded_rows()
+        
+        if len(superseded):
+            df = df.drop(index=superseded).reset_index(drop=True)
+        return df
+    
+    @timed(RETRAIN_STAGE_SECONDS, stage='load', model='')
+    def sample_base_dataset(self, size, half_life=None):
+        """
+        Class-stratified random sample of the base dataset in one streaming pass.
+        
+        Memory stays bounded by the sample size, so this works for datasets
+        that do not fit in RAM. Superseded rows are skipped, as in
+        load_base_dataset.
+        
+        Args:
+            size: Rows in the sample
+            half_life: Optionally favour recent records: one half_life rows
+                newer is twice as likely to be sampled
+            
+        Returns:
+            DataFrame: the sample, in stored order
+        """
+        if not os.path.exists(self.base_dataset_path):
+            raise FileNotFoundError(f"Base dataset not found: {self.base_dataset_path}")
+        
+        manifest, superseded = self._snapshot()
+        
+        sample, counts = stratified_reservoir_sample(
+            iter_dataset_chunks(self.base_dataset_path, manifest=manifest),
+            size, half_life=half_life, drop_positions=superseded
+        )
+        print(f"Sampled {len(sample)} of {sum(counts.values())} rows")
+        return sample
+    
+    def load_training_data(self):
+        """The base dataset, or a sample of it if training_sample_size is set."""
+        if self.config['training_sample_size']:
+            return self.sample_base_dataset(self.config['training_sample_size'],
+                                            self.config['training_sample_half_life'])
+        return self.load_base_dataset()
+    
+    def save_base_dataset(self, df):
+        """Write the full base dataset back to base_dataset_path in its current format."""
+        with self.writer_lock():
+            write_dataset(df, self.base_dataset_path)
+            # Row positions changed; the index is rebuilt on the next append
+            shutil.rmtree(self.dedupe_index_path(), ignore_errors=True)
+    
+    def compact_base_dataset(self):
+        """
+        Drop superseded rows from the base dataset.
+        
+        A segmented store merges its runs of small segments (dropping
+        superseded and duplicate rows in them) while ingestion continues,
+        once compact_min_segments small segments are waiting; any other
+        format is rewritten in full, with appends held off until it is done.
+        
+        Returns:
+            int: segments merged away (segmented store) or rows dropped
+        """
+        if not is_segmented(self.base_dataset_path):
+            # Read, filter and rewrite under one lock hold: rows appended
+            # in between would otherwise be overwritten by the stale frame
+            with self.writer_lock():
+                before = len(read_dataset(self.base_dataset_path, columns=['cgpa']))
+                df = self.load_base_dataset()
+                self.save_base_dataset(df)
+            return before - len(df)
+        
+        store = SegmentStore(self.base_dataset_path)
+        with store.lock():
+            manifest = store.manifest()
+            superseded = self._superseded_rows()
+        removed = store.compact(
+            manifest, drop_positions=superseded,
+            small_segment_rows=self.config['compact_small_segment_rows'],
+            min_segments=self.config['compact_min_segments'],
+            # Row positions moved: remap the index before the lock is released,
+            # so no reader pairs the new segments with the old superseded rows
+            on_commit=self._remap_dedupe_index
+        )
+        if removed:
+            print(f"Compacted base dataset: {removed} segments merged away")
+        return removed
+    
+    def start_background_compaction(self, interval=300):
+        """Run compact_base_dataset every interval seconds in a daemon thread."""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.compact_base_dataset()
+                except Exception as e:
+                    print(f"Background compaction failed: {e}")
+        
+        thread = threading.Thread(target=run, name='dataset-compaction', daemon=True)
+        thread.start()
+        return thread
+    
+    def writer_lock(self):
+        """
+        Cross-process lock held while the base dataset and its dedupe index
+        change: the segmented store's writer lock, or <base>.lock beside a
+        CSV, columnar or sharded base.
+        """
+        if is_segmented(self.base_dataset_path):
+            return SegmentStore(self.base_dataset_path).lock()
+        return FileLock(f"{self.base_dataset_path.rstrip(os.sep)}.lock")
+    
+    def _snapshot(self):
+        """
+        (segmented store manifest or None, superseded rows), read together
+        under the writer lock so the row positions agree.
+        """
+        with self.writer_lock():
+            manifest = None
+            if is_segmented(self.base_dataset_path):
+                manifest = SegmentStore(self.base_dataset_path).manifest()
+            return manifest, self._superseded_rows()
+    
+    def _superseded_rows(self):
+        """Row positions replaced by later records, if the dataset has a dedupe index."""
+        if not os.path.exists(os.path.join(self.dedupe_index_path(), INDEX_META_FILE)):
+            return np.empty(0, dtype=np.int64)
+        return self.open_dedupe_index().superseded()
+    
+    def _remap_dedupe_index(self, position_map):
+        """
+        Move the dedupe index to a compacted store's row positions (see
+        segment_store.PositionMap), under the writer lock. An index that
+        was not up to date before the compaction is rebuilt instead.
+        """
+        path = self.dedupe_index_path()
+        if os.path.exists(os.path.join(path, INDEX_META_FILE)):
+            index = KeyIndex(path)
+            if index.total_rows == position_map.old_rows and len(index.rows) == index.meta['capacity']:
+                try:
+                    index.remap_rows(position_map)
+                except ValueError:
+                    pass
+                else:
+                    index.save_meta(position_map.new_rows, dataset_stamp(self.base_dataset_path))
+                    return index
+        shutil.rmtree(path, ignore_errors=True)
+        return self.open_dedupe_index()
+    
+    def dedupe_index_path(self):
+        return self.config['dedupe_index_path'] or self.base_dataset_path.rstrip(os.sep) + '.index'
+    
+    def _key_arrays(self, df):
+        """(cgpa, iq) as float64 after rounding through the base dataset's storage dtype."""
+        columnar = is_columnar(self.base_dataset_path) or is_segmented(self.base_dataset_path) or (
+            dataset_format(self.base_dataset_path) == 'sharded'
+            and is_columnar(list_shard_paths(self.base_dataset_path)[0])
+        )
+        return tuple(
+            df[col].to_numpy(dtype=COLUMN_DTYPES[col] if columnar else np.float64).astype(np.float64)
+            for col in ('cgpa', 'iq')
+        )
+    
+    def open_dedupe_index(self):
+        """
+        The (cgpa, iq) index of the base dataset, rebuilt with one pass over
+        the dataset if it is missing or out of date.
+        """
+        path = self.dedupe_index_path()
+        stamp = dataset_stamp(self.base_dataset_path)
+        if os.path.exists(os.path.join(path, INDEX_META_FILE)):
+            index = KeyIndex(path)
+            if index.matches(stamp):
+                return index
+        
+        index = KeyIndex.create(path)
+        position = 0
+        for chunk in iter_dataset_chunks(self.base_dataset_path, columns=['cgpa', 'iq']):
+            positions = np.arange(position, position + len(chunk))
+            # Keep-last within the chunk, then against earlier chunks
+            last = ~chunk.duplicated(subset=['cgpa', 'iq'], keep='last').to_numpy()
+            cgpa, iq = self._key_arrays(chunk[last])
+            index.add_superseded(positions[~last])
+            index.add_superseded(index.upsert(cgpa, iq, positions[last]))
+            position += len(chunk)
+        index.save_meta(position, stamp)
+        return index
     
+    @timed(RETRAIN_STAGE_SECONDS, stage='validate', model='')
     def validate_new_data(self, new_df):
         """Validate new data before adding to training set."""
         required_cols = {'cgpa', 'iq', 'placement'}
@@ -79,33 +379,111 @@ class AutoRetrainer:
         """
         Append new verified placement data to the base dataset.
         
+        Only the new rows are read and checked against the persistent
+        (cgpa, iq) index, then appended; the base dataset is never
+        rewritten. A record whose key already exists replaces the older
+        one (keep-last): the older row is marked superseded and dropped by
+        load_base_dataset.
+        
         Args:
-            new_data_path: Path to CSV with new placement records
+            new_data_path: Path to new placement records (CSV or columnar)
             
         Returns:
             int: Number of new samples added
         """
-        base_df = self.load_base_dataset()
-        new_df = pd.read_csv(new_data_path)
+        if not os.path.exists(self.base_dataset_path):
+            raise FileNotFoundError(f"Base dataset not found: {self.base_dataset_path}")
+        new_df = read_dataset(new_data_path)
         
         # Validate
         self.validate_new_data(new_df)
         
-        # Remove duplicates
         initial_count = len(new_df)
-        combined_df = pd.concat([base_df, new_df], ignore_index=True)
-        combined_df = combined_df.drop_duplicates(subset=['cgpa', 'iq'], keep='last')
-        
-        new_samples_added = len(combined_df) - len(base_df)
-        
-        # Save updated dataset
-        combined_df.to_csv(self.base_dataset_path, index=False)
+        new_samples_added, index, _ = self._append_rows(new_df)
         
         print(f"Added {new_samples_added} new samples (filtered {initial_count - new_samples_added} duplicates)")
-        print(f"Total dataset size: {len(combined_df)}")
+        print(f"Total dataset size: {index.size}")
         
         return new_samples_added
     
+    def ingest_new_data(self, new_data_path, rejected_path=None):
+        """
+        Validate new data row by row while streaming it into the base dataset.
+        
+        Unlike append_new_data, the file is never held in memory whole and
+        invalid rows do not fail the batch: they are written with their
+        reasons to rejected_path and the valid rows are appended, in
+        batches of ingest_batch_rows, with the same keep-last deduplication.
+        Large files are validated in parallel processes (see validation).
+        
+        Args:
+            new_data_path: Path to new placement records (CSV, columnar or sharded)
+            rejected_path: CSV file for rejected rows (default: beside the input)
+            
+        Returns:
+            dict: validation stats (see validation.validate_file) plus
+            new_samples, the number of new samples added
+        """
+        if not os.path.exists(self.base_dataset_path):
+            raise FileNotFoundError(f"Base dataset not found: {self.base_dataset_path}")
+        
+        pending, pending_rows = [], 0
+        new_samples = 0
+        index = None
+        
+        def flush():
+            nonlocal pending, pending_rows, new_samples, index
+            if pending:
+                added, index, _ = self._append_rows(pd.concat(pending, ignore_index=True))
+                new_samples += added
+                pending, pending_rows = [], 0
+        
+        def on_valid(chunk):
+            nonlocal pending_rows
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            if pending_rows >= self.config['ingest_batch_rows']:
+                flush()
+        
+        stats = validate_file(new_data_path, on_valid, rejected_path,
+                              n_workers=self.config['ingest_workers'])
+        flush()
+        
+        stats['new_samples'] = new_samples
+        print(f"Validated {stats['rows']} rows at {stats['rows_per_sec']:,.0f} rows/s: "
+              f"{stats['valid_rows']} valid, {stats['rejected_rows']} rejected")
+        if stats['rejected_path']:
+            print(f"Rejected rows written to: {stats['rejected_path']}")
+        print(f"Added {new_samples} new samples (filtered {stats['valid_rows'] - new_samples} duplicates)")
+        if index is not None:
+            print(f"Total dataset size: {index.size}")
+        return stats
+    
+    def _append_rows(self, new_df):
+        """
+        Append validated rows with keep-last deduplication on (cgpa, iq).
+        
+        Returns:
+            tuple: (number of new keys added, the updated KeyIndex, the
+            rows appended: new_df deduplicated keep-last)
+        """
+        # Remove duplicates within the batch, then look the rest up in the index
+        new_df = new_df.drop_duplicates(subset=['cgpa', 'iq'], keep='last').reset_index(drop=True)
+        
+        with self.writer_lock():
+            index = self.open_dedupe_index()
+            cgpa, iq = self._key_arrays(new_df)
+            positions = np.arange(index.total_rows, index.total_rows + len(new_df))
+            
+            # Rows first, index last: an interrupted append leaves a stale index,
+            # which is rebuilt from the dataset on next use
+            append_dataset(new_df, self.base_dataset_path)
+            replaced = index.upsert(cgpa, iq, positions)
+            index.add_superseded(replaced)
+            index.save_meta(index.total_rows + len(new_df), dataset_stamp(self.base_dataset_path))
+        
+        return len(new_df) - len(replaced), index, new_df
+    
     def train_models(self, df):
         """Train multiple models and select the best."""
         X = df[['cgpa', 'iq']]
@@ -121,29 +499,57 @@ class AutoRetrainer:
         X_train_scaled = scaler.fit_transform(X_train)
         X_test_scaled = scaler.transform(X_test)
         
+        # Split the worker budget: one thread per candidate, and the cores
+        # left over go to RandomForest's own tree-level parallelism
+        workers = self.config['train_workers'] or os.cpu_count() or 1
+        candidate_workers = min(workers, 3)
+        forest_jobs = max(1, workers - (candidate_workers - 1))
+        
         # Train models
         models = {
             'logistic': LogisticRegression(max_iter=1000, random_state=42),
-            'random_forest': RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42),
+            'random_forest': RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42,
+                                                    n_jobs=forest_jobs),
             'gradient_boost': GradientBoostingClassifier(n_estimators=100, max_depth=5, random_state=42)
         }
         
-        results = {}
+        # Trained separately on the whole stored dataset, not on df
+        out_of_core = self.config['out_of_core_logistic']
+        if out_of_core:
+            del models['logistic']
         
-        for name, model in models.items():
-            model.fit(X_train_scaled, y_train)
-            y_pred = model.predict(X_test_scaled)
-            y_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
-            
-            accuracy = accuracy_score(y_test, y_pred)
-            auc = roc_auc_score(y_test, y_pred_proba)
-            
-            results[name] = {
-                'model': model,
-                'accuracy': accuracy,
-                'auc': auc,
-                'scaler': scaler
+        searched = {}
+        if self.config['hyperparameter_search']:
+            searched = self.search_hyperparameters(models, X_train_scaled, y_train, workers)
+            for name, params in searched.items():
+                models[name].set_params(**params)
+        
+        # sklearn's tree builders release the GIL, so threads run the fits in
+        # parallel without copying the training data into other processes
+        with ThreadPoolExecutor(max_workers=candidate_workers) as pool:
+            futures = {
+                name: pool.submit(self._fit_candidate, name, model, scaler,
+                                  X_train_scaled, y_train, X_test_scaled, y_test)
+                for name, model in models.items()
             }
+            # Collected in candidate order, so ties resolve as in a sequential run
+            results = {name: future.result() for name, future in futures.items()}
+        if out_of_core:
+            result = self.train_out_of_core_logistic()
+            # Rescored on the shared test split, so all candidates are selected
+            # on the same rows. Its training rows can include some of them,
+            # which a linear model with three coefficients fit on the whole
+            # dataset cannot measurably exploit
+            X_test_ooc = result['scaler'].transform(X_test)
+            result.update(
+                out_of_core_accuracy=result['accuracy'],
+                out_of_core_auc=result['auc'],
+                accuracy=accuracy_score(y_test, result['model'].predict(X_test_ooc)),
+                auc=roc_auc_score(y_test, result['model'].predict_proba(X_test_ooc)[:, 1])
+            )
+            results = {'logistic': result, **results}
+        for name, params in searched.items():
+            results[name]['params'] = params
         
         # Select best model
         best_name = max(results.keys(), key=lambda k: results[k]['auc'])
@@ -151,21 +557,267 @@ class AutoRetrainer:
         
         return best_result, best_name, results
     
+    def search_hyperparameters(self, models, X_train, y_train, workers):
+        """
+        Successive-halving search for each candidate within search_budget_seconds.
+        
+        The budget is shared out as the search goes: each candidate may use
+        an equal part of whatever the earlier ones left. Candidates whose
+        search finishes no rung keep their default configuration.
+        
+        Args:
+            models: Candidate name -> unfitted estimator with its defaults
+            X_train: Scaled training features
+            y_train: Training labels
+            workers: Configurations fit in parallel
+            
+        Returns:
+            dict: Candidate name -> chosen parameters (only candidates searched)
+        """
+        spaces = self.config['search_spaces'] or SEARCH_SPACES
+        names = [name for name in models if spaces.get(name)]
+        end = time.monotonic() + self.config['search_budget_seconds']
+        
+        searched = {}
+        for i, name in enumerate(names):
+            start = time.perf_counter()
+            deadline = time.monotonic() + (end - time.monotonic()) / (len(names) - i)
+            params, rungs = successive_halving(
+                models[name], spaces[name], X_train, y_train,
+                factor=self.config['search_reduction_factor'],
+                min_samples=self.config['search_min_samples'],
+                max_configs=self.config['search_max_configs'],
+                deadline=deadline,
+                workers=workers
+            )
+            search_seconds = time.perf_counter() - start
+            if metrics.ENABLED:
+                RETRAIN_STAGE_SECONDS.observe(search_seconds, stage='search', model=name)
+            
+            tried = len(rungs[0]['scores']) if rungs else 0
+            print(f"Search {name}: {tried} configurations, {len(rungs)} rungs, "
+                  f"{search_seconds:.1f}s -> {params or 'defaults'}")
+            if params:
+                searched[name] = params
+        return searched
+    
+    def train_out_of_core_logistic(self):
+        """
+        Fit the logistic candidate on the full base dataset without loading it.
+        
+        The scaler statistics and a log-loss SGDClassifier are fit block by
+        block from the memory-mapped columns (see out_of_core), with the
+        train/test split made by row index. Superseded rows are skipped. The
+        base dataset must be columnar, segmented or sharded columnar.
+        
+        Returns:
+            dict: result in the train_models format; its holdout is drawn
+            from the whole dataset, not df's test split (train_models
+            rescores it on that split before comparing candidates)
+        """
+        manifest, superseded = self._snapshot()
+        dataset = MappedDataset(columnar_parts(self.base_dataset_path, manifest), superseded)
+        
+        start = time.perf_counter()
+        fitted = fit_out_of_core_logistic(
+            dataset,
+            test_size=self.config['test_size'],
+            epochs=self.config['out_of_core_epochs'],
+            block_rows=self.config['out_of_core_block_rows']
+        )
+        train_seconds = time.perf_counter() - start
+        if metrics.ENABLED:
+            RETRAIN_STAGE_SECONDS.observe(train_seconds, stage='train', model='logistic')
+        print(f"Out-of-core logistic: {fitted['train_rows']} training rows, {train_seconds:.1f}s")
+        
+        return {
+            'model': fitted['model'],
+            'accuracy': fitted['accuracy'],
+            'auc': fitted['auc'],
+            'scaler': fitted['scaler'],
+            'train_seconds': train_seconds
+        }
+    
+    def warm_start_skip_reason(self, deployed):
+        """Why train_warm_start cannot extend the deployed model, or None if it can."""
+        if not isinstance(deployed, dict):
+            return "no model is deployed"
+        model = deployed.get('model')
+        if 'scaler' not in deployed:
+            return "the deployed artifact has no scaler"
+        if type(model) not in WARM_START_FAMILIES:
+            return f"{type(model).__name__} models cannot be extended"
+        if isinstance(model, LogisticRegression) and model.solver == 'liblinear':
+            return "the liblinear solver ignores warm_start"
+        if not isinstance(model, LogisticRegression):
+            extended = model.n_estimators + self.config['warm_start_extra_estimators']
+            if extended > self.config['warm_start_max_estimators']:
+                return (f"{extended} estimators would exceed warm_start_max_estimators "
+                        f"({self.config['warm_start_max_estimators']})")
+        return None
+    
+    def warm_start_supported(self, deployed):
+        """True if the deployed model can be extended by train_warm_start."""
+        return self.warm_start_skip_reason(deployed) is None
+    
+    def train_warm_start(self, df, deployed):
+        """
+        Continue training the deployed model on the enlarged dataset.
+        
+        LogisticRegression starts its solver from the previous coefficients;
+        RandomForest and GradientBoosting keep their fitted trees/stages and
+        add warm_start_extra_estimators more, fit on the new training split.
+        The deployed scaler is reused unchanged, since the kept coefficients
+        and trees are only valid in its feature space. Only the deployed
+        model family is trained; cold retrains re-select the family.
+        
+        Kept trees may have been fit on rows that are now in the holdout, so
+        an extended ensemble's holdout accuracy can read slightly high;
+        retrain(compare_cold=True) reports the cold figure alongside.
+        
+        Args:
+            df: Full training dataset
+            deployed: The deployed model dict (see load_deployed_model)
+            
+        Returns:
+            tuple: (best_result, best_name, results) as from train_models
+        """
+        X_train, X_test, y_train, y_test = train_test_split(
+            df[['cgpa', 'iq']], df['placement'], test_size=self.config['test_size'],
+            random_state=42, stratify=df['placement']
+        )
+        scaler = deployed['scaler']
+        name = deployed.get('model_name') or WARM_START_FAMILIES[type(deployed['model'])]
+        
+        model = copy.deepcopy(deployed['model'])
+        model.set_params(warm_start=True)
+        if not isinstance(model, LogisticRegression):
+            model.set_params(n_estimators=model.n_estimators + self.config['warm_start_extra_estimators'])
+        if isinstance(model, RandomForestClassifier):
+            model.set_params(n_jobs=self.config['train_workers'] or os.cpu_count() or 1)
+        
+        result = self._fit_candidate(name, model, scaler, scaler.transform(X_train), y_train,
+                                     scaler.transform(X_test), y_test)
+        model.set_params(warm_start=False)
+        return result, name, {name: result}
+    
+    def _fit_candidate(self, name, model, scaler, X_train, y_train, X_test, y_test):
+        """Fit and evaluate one candidate model."""
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        train_seconds = time.perf_counter() - start
+        if metrics.ENABLED:
+            RETRAIN_STAGE_SECONDS.observe(train_seconds, stage='train', model=name)
+        
+        # Seed-determined, so n_jobs does not change the fitted model; reset it
+        # so the saved artifact matches a sequential run
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=None)
+        
+        y_pred = model.predict(X_test)
+        y_pred_proba = model.predict_proba(X_test)[:, 1]
+        
+        return {
+            'model': model,
+            'accuracy': accuracy_score(y_test, y_pred),
+            'auc': roc_auc_score(y_test, y_pred_proba),
+            'scaler': scaler,
+            'train_seconds': train_seconds
+        }
+    
     def backup_model(self):
-        """Create backup of current model."""
-        if os.path.exists(self.model_save_path):
+        """
+        Create backup of current model.
+        
+        The model is copied, not moved, so model_save_path stays loadable
+        until the new model atomically replaces it.
+        """
+        if os.path.isdir(self.model_save_path):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_path = f"{self.model_save_path.rstrip(os.sep)}_backup_{timestamp}"
+            shutil.copytree(self.model_save_path, backup_path)
+            print(f"Backed up old model to: {backup_path}")
+        elif os.path.exists(self.model_save_path):
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_path = self.model_save_path.replace('.pkl', f'_backup_{timestamp}.pkl')
-            os.rename(self.model_save_path, backup_path)
+            shutil.copy2(self.model_save_path, backup_path)
             print(f"Backed up old model to: {backup_path}")
     
-    def retrain(self, new_data_path=None, force=False):
+    def get_registry(self):
+        """The configured ModelRegistry, or None when saving to model_save_path."""
+        if not self.config['registry_dir']:
+            return None
+        return ModelRegistry(self.config['registry_dir'], self.config['registry_keep_versions'])
+    
+    def deploy_model(self, model_data, model_metrics, fingerprint=None):
+        """
+        Publish a trained model to the registry, or back up and replace
+        model_save_path.
+        
+        Returns:
+            str: path of the saved artifact
+        """
+        save_start = time.perf_counter()
+        registry = self.get_registry()
+        if registry is not None:
+            # Older versions stay in the registry, so no separate backup is needed
+            entry = registry.publish(
+                model_data,
+                metrics=model_metrics,
+                dataset_fingerprint=fingerprint,
+                version=model_data['version'],
+                artifact_format=self.config['artifact_format']
+            )
+            saved_path = os.path.join(registry.registry_dir, entry['path'])
+        else:
+            if self.config['backup_old_model']:
+                self.backup_model()
+            save_artifact(model_data, self.model_save_path, self.config['artifact_format'])
+            saved_path = self.model_save_path
+        if metrics.ENABLED:
+            RETRAIN_STAGE_SECONDS.observe(time.perf_counter() - save_start, stage='save',
+                                          model=model_data['model_name'])
+        return saved_path
+    
+    def load_deployed_model(self):
+        """
+        The currently deployed model dict, or None if nothing is deployed.
+        
+        A compiled tree ensemble in an 'mmap' artifact is returned as its
+        sklearn estimator, so it can be retrained.
+        """
+        registry = self.get_registry()
+        path = registry.current_path() if registry is not None else self.model_save_path
+        if path is None or not os.path.exists(path):
+            return None
+        return load_artifact(path, mmap=False, estimator=True)
+    
+    def retrain_lock(self, timeout=None):
+        """
+        Cross-process lock held while retraining, so retrains of the same
+        base dataset never overlap. Reentrant within a thread.
+        """
+        return FileLock(f"{self.base_dataset_path.rstrip(os.sep)}.retrain.lock", timeout)
+    
+    def live_rows(self):
+        """Rows in the base dataset not superseded by later records."""
+        with self.writer_lock():
+            return self.open_dedupe_index().size
+    
+    @_exclusive
+    def retrain(self, new_data_path=None, force=False, warm_start=None, compare_cold=False):
         """
         Main retraining function.
         
         Args:
             new_data_path: Path to new data CSV (optional)
             force: Force retrain even if below minimum sample threshold
+            warm_start: Extend the deployed model (see train_warm_start)
+                instead of training every candidate from scratch; falls back
+                to a cold retrain when the deployed model does not support it
+                (default: the warm_start config setting)
+            compare_cold: With a warm start, also time a cold retrain and
+                compare its holdout accuracy
             
         Returns:
             dict: Training results and metrics
@@ -176,7 +828,9 @@ class AutoRetrainer:
         
         # Add new data if provided
         new_samples = 0
-        if new_data_path:
+        if new_data_path and self.config['reject_invalid_rows']:
+            new_samples = self.ingest_new_data(new_data_path)['new_samples']
+        elif new_data_path:
             new_samples = self.append_new_data(new_data_path)
         
         # Check if retraining is needed
@@ -185,12 +839,45 @@ class AutoRetrainer:
             print("Skipping retraining. Use force=True to retrain anyway.")
             return {'status': 'skipped', 'reason': 'insufficient_samples'}
         
-        # Load full dataset
-        df = self.load_base_dataset()
+        # Load full dataset (or a bounded sample of it)
+        df = self.load_training_data()
         print(f"\nTraining on {len(df)} total samples...")
         
         # Train models
-        best_result, best_name, all_results = self.train_models(df)
+        if warm_start is None:
+            warm_start = self.config['warm_start']
+        warm_start_skipped = None
+        if warm_start:
+            deployed = self.load_deployed_model()
+            warm_start_skipped = self.warm_start_skip_reason(deployed)
+            if warm_start_skipped:
+                print(f"Warm start skipped: {warm_start_skipped}")
+        mode = 'warm_start' if warm_start and not warm_start_skipped else 'cold'
+        
+        train_start = time.perf_counter()
+        if mode == 'warm_start':
+            best_result, best_name, all_results = self.train_warm_start(df, deployed)
+        else:
+            best_result, best_name, all_results = self.train_models(df)
+        train_seconds = time.perf_counter() - train_start
+        print(f"Mode: {mode} ({train_seconds:.2f}s)")
+        
+        comparison = None
+        if compare_cold and mode == 'warm_start':
+            cold_start = time.perf_counter()
+            cold_result, cold_name, _ = self.train_models(df)
+            cold_seconds = time.perf_counter() - cold_start
+            comparison = {
+                'warm_start_seconds': train_seconds,
+                'cold_seconds': cold_seconds,
+                'speedup': cold_seconds / train_seconds if train_seconds > 0 else None,
+                'warm_start_accuracy': best_result['accuracy'],
+                'cold_accuracy': cold_result['accuracy'],
+                'cold_model_name': cold_name,
+                'accuracy_delta': best_result['accuracy'] - cold_result['accuracy']
+            }
+            print(f"Cold retrain: {cold_seconds:.2f}s vs warm start {train_seconds:.2f}s; "
+                  f"holdout accuracy {cold_result['accuracy']:.4f} vs warm start {best_result['accuracy']:.4f}")
         
         # Display results
         print(f"\nModel Performance:")
@@ -204,11 +891,8 @@ class AutoRetrainer:
             print(f"\nWARNING: Best model accuracy ({best_result['accuracy']:.4f}) below threshold")
             print(f"Threshold: {self.config['min_accuracy_threshold']:.4f}")
             print("Model NOT saved. Check your data quality.")
-            return {'status': 'failed', 'reason': 'accuracy_below_threshold', 'accuracy': best_result['accuracy']}
-        
-        # Backup old model
-        if self.config['backup_old_model']:
-            self.backup_model()
+            return {'status': 'failed', 'reason': 'accuracy_below_threshold', 'mode': mode,
+                    'accuracy': best_result['accuracy'], 'comparison': comparison}
         
         # Save new model
         model_data = {
@@ -219,10 +903,15 @@ class AutoRetrainer:
             'auc': best_result['auc'],
             'train_date': datetime.now().isoformat(),
             'total_samples': len(df),
-            'version': self.config['model_version'] + 1
+            'version': self.config['model_version'] + 1,
+            'probability_grid': build_probability_grid(best_result['model'], best_result['scaler'])
         }
         
-        joblib.dump(model_data, self.model_save_path)
+        saved_path = self.deploy_model(
+            model_data,
+            {'accuracy': best_result['accuracy'], 'auc': best_result['auc'], 'mode': mode},
+            dataset_fingerprint(df)
+        )
         
         # Update config
         self.config['last_train_date'] = datetime.now().isoformat()
@@ -230,7 +919,7 @@ class AutoRetrainer:
         self.config['model_version'] += 1
         self.save_config()
         
-        print(f"\nModel saved: {self.model_save_path}")
+        print(f"\nModel saved: {saved_path}")
         print(f"Version: {self.config['model_version']}")
         print(f"Accuracy: {best_result['accuracy']:.4f}")
         print(f"AUC: {best_result['auc']:.4f}")
@@ -242,7 +931,181 @@ class AutoRetrainer:
             'accuracy': best_result['accuracy'],
             'auc': best_result['auc'],
             'version': self.config['model_version'],
-            'total_samples': len(df)
+            'total_samples': len(df),
+            'mode': mode,
+            'warm_start_skipped': warm_start_skipped,
+            'train_seconds': train_seconds,
+            'comparison': comparison
+        }
+    
+    def _fit_incremental_model(self, df):
+        """
+        Full refit of the incremental model: a StandardScaler and a
+        log-loss SGDClassifier, the logistic model that supports partial_fit.
+        
+        Returns:
+            dict: model, scaler, holdout accuracy/auc and the holdout itself
+            as float64 features and labels, capped at incremental_holdout_rows
+        """
+        # float64 throughout, so later partial_fit batches match whatever the storage dtype
+        X_train, X_test, y_train, y_test = train_test_split(
+            df[['cgpa', 'iq']].astype(np.float64), df['placement'], test_size=self.config['test_size'],
+            random_state=42, stratify=df['placement']
+        )
+        scaler = StandardScaler().fit(X_train)
+        model = SGDClassifier(loss='log_loss', random_state=42)
+        model.fit(scaler.transform(X_train), y_train)
+        
+        X_test_scaled = scaler.transform(X_test)
+        keep = self.config['incremental_holdout_rows']
+        return {
+            'model': model,
+            'scaler': scaler,
+            'accuracy': accuracy_score(y_test, model.predict(X_test_scaled)),
+            'auc': roc_auc_score(y_test, model.predict_proba(X_test_scaled)[:, 1]),
+            # Stratified and shuffled by the split, so the first rows are a fair sample
+            'holdout': (X_test.to_numpy()[:keep], y_test.to_numpy()[:keep])
+        }
+    
+    @staticmethod
+    def _holdout_scores(model, scaler, holdout):
+        """(accuracy, auc) of a model on a stored holdout; auc is None for a single class."""
+        X_test, y_test = holdout
+        X_test_scaled = scaler.transform(pd.DataFrame(X_test, columns=['cgpa', 'iq']))
+        accuracy = accuracy_score(y_test, model.predict(X_test_scaled))
+        auc = (roc_auc_score(y_test, model.predict_proba(X_test_scaled)[:, 1])
+               if len(np.unique(y_test)) == 2 else None)
+        return accuracy, auc
+    
+    @_exclusive
+    def retrain_incremental(self, new_data_path, compare_full=False):
+        """
+        Update the deployed model with only the new samples.
+        
+        The scaler's running mean/variance and the SGD weights are updated
+        with partial_fit on the new batch, so the cost scales with the batch
+        instead of the dataset. Each update is scored on the holdout kept
+        from the last full refit, which partial_fit never sees. A full refit
+        runs instead when nothing incremental (or no holdout) is deployed
+        yet, or as a safety net every incremental_full_refit_every updates.
+        
+        Args:
+            new_data_path: Path to new placement records (CSV or columnar)
+            compare_full: Also time a full refit and compare holdout accuracy
+            
+        Returns:
+            dict: Training results and metrics
+        """
+        print("\n" + "="*70)
+        print("INCREMENTAL RETRAINING")
+        print("="*70)
+        
+        start = time.perf_counter()
+        if not os.path.exists(self.base_dataset_path):
+            raise FileNotFoundError(f"Base dataset not found: {self.base_dataset_path}")
+        new_df = read_dataset(new_data_path)
+        self.validate_new_data(new_df)
+        # The batch as appended: duplicate keys within it are dropped keep-last
+        new_samples, _, new_df = self._append_rows(new_df)
+        
+        deployed = self.load_deployed_model()
+        refit_due = self.config['incremental_updates_since_refit'] >= self.config['incremental_full_refit_every']
+        incremental = (isinstance(deployed, dict) and isinstance(deployed.get('model'), SGDClassifier)
+                       and deployed.get('holdout') is not None and not refit_due)
+        
+        update_start = time.perf_counter()
+        if incremental:
+            model, scaler = deployed['model'], deployed['scaler']
+            X_new = new_df[['cgpa', 'iq']].astype(np.float64)
+            y_new = new_df['placement'].to_numpy()
+            
+            scaler.partial_fit(X_new)
+            X_new_scaled = scaler.transform(X_new)
+            model.partial_fit(X_new_scaled, y_new, classes=np.array([0, 1]))
+            
+            # The refit's holdout: fixed-size, so the cost stays O(batch)
+            holdout = deployed['holdout']
+            accuracy, auc = self._holdout_scores(model, scaler, holdout)
+            total_samples = deployed.get('total_samples', 0) + new_samples
+            fingerprint = None
+            updates_since_refit = self.config['incremental_updates_since_refit'] + 1
+            mode = 'incremental'
+        else:
+            df = self.load_base_dataset()
+            fitted = self._fit_incremental_model(df)
+            model, scaler = fitted['model'], fitted['scaler']
+            accuracy, auc = fitted['accuracy'], fitted['auc']
+            holdout = fitted['holdout']
+            total_samples = len(df)
+            fingerprint = dataset_fingerprint(df)
+            updates_since_refit = 0
+            mode = 'full_refit'
+        update_seconds = time.perf_counter() - update_start
+        
+        print(f"Mode: {mode} ({new_samples} new samples, {total_samples} total)")
+        print(f"Accuracy: {accuracy:.4f} (holdout)")
+        
+        comparison = None
+        if compare_full and incremental:
+            full_start = time.perf_counter()
+            fitted = self._fit_incremental_model(self.load_base_dataset())
+            full_seconds = time.perf_counter() - full_start
+            incremental_accuracy, _ = self._holdout_scores(model, scaler, fitted['holdout'])
+            comparison = {
+                'incremental_seconds': update_seconds,
+                'full_refit_seconds': full_seconds,
+                'speedup': full_seconds / update_seconds if update_seconds > 0 else None,
+                'incremental_accuracy': incremental_accuracy,
+                'full_refit_accuracy': fitted['accuracy'],
+                'accuracy_delta': incremental_accuracy - fitted['accuracy']
+            }
+            print(f"Full refit: {full_seconds:.3f}s vs incremental {update_seconds:.3f}s; "
+                  f"holdout accuracy {fitted['accuracy']:.4f} vs incremental {incremental_accuracy:.4f}")
+        
+        if accuracy < self.config['min_accuracy_threshold']:
+            print(f"\nWARNING: Accuracy ({accuracy:.4f}) below threshold")
+            print(f"Threshold: {self.config['min_accuracy_threshold']:.4f}")
+            print("Model NOT saved. Check your data quality.")
+            return {'status': 'failed', 'reason': 'accuracy_below_threshold', 'mode': mode,
+                    'accuracy': accuracy, 'comparison': comparison}
+        
+        model_data = {
+            'model': model,
+            'scaler': scaler,
+            'model_name': 'sgd_logistic',
+            'accuracy': accuracy,
+            'auc': auc,
+            'train_date': datetime.now().isoformat(),
+            'total_samples': total_samples,
+            'version': self.config['model_version'] + 1,
+            'probability_grid': build_probability_grid(model, scaler),
+            'holdout': holdout
+        }
+        saved_path = self.deploy_model(model_data, {'accuracy': accuracy, 'auc': auc, 'mode': mode}, fingerprint)
+        
+        self.config['last_train_date'] = datetime.now().isoformat()
+        self.config['total_samples_trained'] = total_samples
+        self.config['model_version'] += 1
+        self.config['incremental_updates_since_refit'] = updates_since_refit
+        self.save_config()
+        
+        seconds = time.perf_counter() - start
+        print(f"\nModel saved: {saved_path}")
+        print(f"Version: {self.config['model_version']}")
+        print(f"Time: {seconds:.3f}s (model update {update_seconds:.3f}s)")
+        print("="*70)
+        
+        return {
+            'status': 'success',
+            'mode': mode,
+            'model_name': 'sgd_logistic',
+            'accuracy': accuracy,
+            'auc': auc,
+            'version': self.config['model_version'],
+            'total_samples': total_samples,
+            'seconds': seconds,
+            'update_seconds': update_seconds,
+            'comparison': comparison
         }
     
     def schedule_retrain_check(self):
@@ -253,8 +1116,8 @@ class AutoRetrainer:
         last_train = datetime.fromisoformat(self.config['last_train_date'])
         days_since_train = (datetime.now() - last_train).days
         
-        # Retrain if more than 30 days since last training
-        return days_since_train >= 30
+        # Retrain if more than retrain_interval_days since last training
+        return days_since_train >= self.config['retrain_interval_days']
 
 
 # ============================================
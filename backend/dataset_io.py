@@ -0,0 +1,561 @@
+# backend/dataset_io.py
+
+"""
+Dataset storage for the placement data.
+
+Besides CSV, datasets can be stored in a binary columnar layout: a
+directory holding one .npy file per column plus a small schema.json.
+The .npy files are opened with memory mapping, so reading tens of
+millions of rows needs no text parsing. CSV stays the import/export
+format.
+
+A dataset path is one of:
+    * a .csv file
+    * a columnar directory (contains schema.json)
+    * a sharded directory of part-NNNNN.csv files or part-NNNNN columnar
+      directories, read back in shard order as one dataset
+    * a segmented store (see segment_store): immutable columnar segments
+      listed, in order, by a manifest.json
+"""
+
+import os
+import glob
+import json
+import shutil
+import struct
+import numpy as np
+import pandas as pd
+
+# Storage dtypes for the known columns; other numeric columns keep their own
+COLUMN_DTYPES = {
+    'cgpa': np.float32,
+    'iq': np.float32,
+    'placement': np.uint8,
+    'prediction': np.uint8,
+    'probability': np.float32,
+}
+
+SCHEMA_FILE = 'schema.json'
+
+# Segmented store layout (written by segment_store.SegmentStore)
+SEGMENT_MANIFEST_FILE = 'manifest.json'
+SEGMENTS_DIR = 'segments'
+
+
+# -----------------------------
+# Format detection
+# -----------------------------
+def is_columnar(path):
+    """True if path is a columnar dataset directory."""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, SCHEMA_FILE))
+
+
+def is_segmented(path):
+    """True if path is a segmented dataset store."""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, SEGMENT_MANIFEST_FILE))
+
+
+def read_segment_manifest(path):
+    """The manifest of a segmented store."""
+    with open(os.path.join(path, SEGMENT_MANIFEST_FILE), 'r') as f:
+        return json.load(f)
+
+
+def segment_paths(path, manifest=None):
+    """
+    Segment directories of a segmented store, oldest first.
+
+    Segments are immutable, so the list read from one manifest is a
+    consistent snapshot even while new segments are being added.
+    """
+    manifest = manifest or read_segment_manifest(path)
+    return [os.path.join(path, SEGMENTS_DIR, seg['name']) for seg in manifest['segments']]
+
+
+def shard_path(out_dir, shard_index, file_format='csv'):
+    """Path of the part file (or part directory) written for one shard."""
+    name = f'part-{shard_index:05d}'
+    return os.path.join(out_dir, name + '.csv' if file_format == 'csv' else name)
+
+
+def list_shard_paths(path):
+    """Part files/directories of a sharded dataset directory, in shard order."""
+    return sorted(glob.glob(os.path.join(path, 'part-*')))
+
+
+def dataset_format(path):
+    """
+    Storage format for a dataset path: 'csv', 'columnar', 'sharded' or
+    'segmented'.
+
+    Paths that do not exist yet are 'csv' if they end in .csv and
+    'columnar' otherwise.
+    """
+    if is_columnar(path):
+        return 'columnar'
+    if is_segmented(path):
+        return 'segmented'
+    if os.path.isdir(path):
+        return 'sharded'
+    if os.path.exists(path) or path.lower().endswith('.csv'):
+        return 'csv'
+    return 'columnar'
+
+
+def storage_dtypes(df):
+    """Map of column -> storage dtype for the known columns present in df."""
+    return {col: dtype for col, dtype in COLUMN_DTYPES.items() if col in df.columns}
+
+
+# -----------------------------
+# Columnar read / write
+# -----------------------------
+def _read_schema(path):
+    with open(os.path.join(path, SCHEMA_FILE), 'r') as f:
+        return json.load(f)
+
+
+def _write_schema(path, columns, rows):
+    # Swapped in whole: the schema's row count is what readers trust
+    schema_path = os.path.join(path, SCHEMA_FILE)
+    with open(schema_path + '.tmp', 'w') as f:
+        json.dump({'columns': columns, 'rows': int(rows)}, f, indent=2)
+    os.replace(schema_path + '.tmp', schema_path)
+
+
+def read_columns(path, columns=None, mmap=True):
+    """
+    Open a columnar dataset as a dict of numpy arrays.
+
+    Args:
+        path: Columnar dataset directory
+        columns: Columns to open (default: all, in schema order)
+        mmap: Memory-map the arrays read-only instead of loading them
+
+    Returns:
+        dict: column name -> numpy array (np.memmap when mmap is True),
+        cut to the schema's row count; rows of an unfinished append are
+        not returned
+    """
+    schema = _read_schema(path)
+    columns = columns or schema['columns']
+    missing = set(columns) - set(schema['columns'])
+    if missing:
+        raise ValueError(f"Columns not in dataset {path}: {sorted(missing)}")
+    mmap_mode = 'r' if mmap else None
+    return {
+        col: np.load(os.path.join(path, f'{col}.npy'), mmap_mode=mmap_mode)[:schema['rows']]
+        for col in columns
+    }
+
+
+def columnar_rows(path):
+    """Row count of a columnar dataset, from its schema."""
+    return _read_schema(path)['rows']
+
+
+def columnar_parts(path, manifest=None):
+    """
+    Columnar directories holding a dataset's rows, in stored order.
+
+    Args:
+        path: Columnar directory, segmented store or sharded directory of
+            columnar parts
+        manifest: Snapshot of a segmented store to use (default: current)
+
+    Raises:
+        ValueError: if any of the data is stored as CSV
+    """
+    fmt = dataset_format(path)
+    if fmt == 'columnar':
+        return [path]
+    if fmt == 'segmented':
+        return segment_paths(path, manifest)
+    if fmt == 'sharded':
+        part_paths = list_shard_paths(path)
+        if part_paths and all(is_columnar(p) for p in part_paths):
+            return part_paths
+    raise ValueError(f"Dataset is not stored in columnar form: {path} "
+                     f"(convert it with convert_dataset)")
+
+
+def read_columnar_slice(path, start, stop, columns=None):
+    """Rows [start, stop) of a columnar dataset as a DataFrame, read from the memory map."""
+    arrays = read_columns(path, columns, mmap=True)
+    return pd.DataFrame({col: np.array(a[start:stop]) for col, a in arrays.items()})
+
+
+def write_columns(path, df):
+    """
+    Write a DataFrame as a columnar dataset directory.
+
+    Known columns are stored with their COLUMN_DTYPES dtype; other numeric
+    columns keep their own dtype. Non-numeric columns are not supported.
+    """
+    os.makedirs(path, exist_ok=True)
+    dtypes = storage_dtypes(df)
+    for col in df.columns:
+        if col not in dtypes and not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"Column '{col}' is not numeric and cannot be stored in columnar format")
+        values = df[col].to_numpy(dtype=dtypes.get(col))
+        # Write beside and swap in, so readers still mapping the old file are unaffected
+        col_path = os.path.join(path, f'{col}.npy')
+        with open(col_path + '.tmp', 'wb') as f:
+            np.save(f, values)
+        os.replace(col_path + '.tmp', col_path)
+    _write_schema(path, list(df.columns), len(df))
+
+
+# Fixed .npy header size, so the row count can be filled in once writing ends
+_NPY_HEADER_SIZE = 128
+
+
+def _npy_header(dtype, n_rows):
+    """A version 1.0 .npy header for a 1-D array, padded to _NPY_HEADER_SIZE bytes."""
+    prefix = np.lib.format.magic(1, 0)
+    header_len = _NPY_HEADER_SIZE - len(prefix) - 2
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(np.dtype(dtype)), n_rows
+    )
+    header = header.ljust(header_len - 1) + '\n'
+    return prefix + struct.pack('<H', header_len) + header.encode('latin1')
+
+
+class ColumnarWriter:
+    """
+    Streams chunks into a columnar dataset directory.
+
+    Each chunk's columns are appended to their .npy files as raw bytes and
+    the headers are finalised with the row count on close(), so any number
+    of rows can be written while only one chunk is held in memory.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+        self.dtypes = {}
+        self.files = {}
+        self.rows = 0
+        os.makedirs(path, exist_ok=True)
+
+    def _open(self, chunk):
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        for col in self.columns:
+            if col in COLUMN_DTYPES:
+                dtype = np.dtype(COLUMN_DTYPES[col])
+            elif pd.api.types.is_numeric_dtype(chunk[col]):
+                dtype = chunk[col].to_numpy().dtype
+            else:
+                raise ValueError(f"Column '{col}' is not numeric and cannot be stored in columnar format")
+            self.dtypes[col] = dtype
+            f = open(os.path.join(self.path, f'{col}.npy.tmp'), 'wb')
+            f.write(_npy_header(dtype, 0))
+            self.files[col] = f
+
+    def write(self, chunk):
+        """Append the next chunk of rows."""
+        if not self.files:
+            self._open(chunk)
+        for col in self.columns:
+            self.files[col].write(chunk[col].to_numpy(dtype=self.dtypes[col]).tobytes())
+        self.rows += len(chunk)
+
+    def close(self):
+        """Write the final headers, swap the files in and write the schema."""
+        if self.columns is None:
+            raise ValueError("No data was written; column names are unknown")
+        for col in self.columns:
+            f = self.files[col]
+            f.seek(0)
+            f.write(_npy_header(self.dtypes[col], self.rows))
+            f.close()
+            col_path = os.path.join(self.path, f'{col}.npy')
+            os.replace(col_path + '.tmp', col_path)
+        self.files = {}
+        _write_schema(self.path, self.columns, self.rows)
+
+
+class CSVWriter:
+    """Streams chunks into one CSV file, writing the header with the first chunk."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+
+    def write(self, chunk):
+        """Append the next chunk of rows."""
+        chunk.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=(self.rows == 0), index=False)
+        self.rows += len(chunk)
+
+    def close(self):
+        pass
+
+
+def open_dataset_writer(path, file_format=None, columns=None):
+    """
+    Open a chunk writer for a CSV file or columnar directory.
+
+    Args:
+        path: Destination path
+        file_format: 'csv' or 'columnar' (default: inferred from path)
+        columns: Columns to write for columnar output (default: all)
+
+    Returns:
+        CSVWriter or ColumnarWriter with write(chunk) and close()
+    """
+    if (file_format or dataset_format(path)) == 'csv':
+        return CSVWriter(path)
+    return ColumnarWriter(path, columns)
+
+
+# -----------------------------
+# Any-format read / write
+# -----------------------------
+def read_dataset(path, columns=None, mmap=True):
+    """
+    Load a dataset in any supported format as a DataFrame.
+
+    Args:
+        path: CSV file, columnar directory, sharded directory or segmented store
+        columns: Columns to load (default: all)
+        mmap: Memory-map columnar data instead of reading it into memory
+
+    Returns:
+        DataFrame
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dataset not found: {path}")
+
+    fmt = dataset_format(path)
+    if fmt == 'columnar':
+        return pd.DataFrame(read_columns(path, columns, mmap=mmap))
+    if fmt == 'segmented':
+        manifest = read_segment_manifest(path)
+        parts = [read_dataset(p, columns, mmap=mmap) for p in segment_paths(path, manifest)]
+        if not parts:
+            return pd.DataFrame({col: pd.Series(dtype=COLUMN_DTYPES.get(col, np.float64))
+                                 for col in (columns or manifest['columns'])})
+        return pd.concat(parts, ignore_index=True)
+    if fmt == 'sharded':
+        part_paths = list_shard_paths(path)
+        if not part_paths:
+            raise FileNotFoundError(f"No dataset parts found in: {path}")
+        return pd.concat(
+            [read_dataset(p, columns, mmap=mmap) for p in part_paths], ignore_index=True
+        )
+    return pd.read_csv(path, usecols=columns)
+
+
+def iter_dataset_chunks(path, chunksize=100_000, columns=None, manifest=None):
+    """
+    Yield a dataset in any supported format as DataFrame chunks.
+
+    Only one chunk is held in memory at a time: CSV is parsed chunk by
+    chunk, columnar data is sliced from the memory-mapped arrays.
+
+    Args:
+        path: CSV file, columnar directory, sharded directory or segmented store
+        chunksize: Maximum rows per chunk
+        columns: Columns to load (default: all)
+        manifest: Snapshot of a segmented store to read (default: current)
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dataset not found: {path}")
+
+    fmt = dataset_format(path)
+    if fmt == 'columnar':
+        for start in range(0, columnar_rows(path), chunksize):
+            yield read_columnar_slice(path, start, start + chunksize, columns)
+    elif fmt == 'segmented':
+        for part_path in segment_paths(path, manifest):
+            yield from iter_dataset_chunks(part_path, chunksize, columns)
+    elif fmt == 'sharded':
+        for part_path in list_shard_paths(path):
+            yield from iter_dataset_chunks(part_path, chunksize, columns)
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def write_dataset(df, path, file_format=None):
+    """
+    Write a DataFrame to path, replacing what is there.
+
+    Args:
+        df: DataFrame to write
+        path: Destination; a sharded directory is collapsed into one part
+            and a segmented store is replaced by a single segment
+        file_format: 'csv', 'columnar' or 'segmented' (default: inferred
+            from path)
+    """
+    fmt = dataset_format(path)
+    if fmt == 'segmented' or file_format == 'segmented':
+        _segment_store(path, create=True).replace(df)
+        return
+    if fmt == 'sharded':
+        part_paths = list_shard_paths(path)
+        part_format = file_format or ('csv' if part_paths and part_paths[0].endswith('.csv') else 'columnar')
+        for part_path in part_paths:
+            remove_dataset(part_path)
+        write_dataset(df, shard_path(path, 0, part_format), part_format)
+        return
+    if (file_format or fmt) == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        write_columns(path, df)
+
+
+def dataset_columns(path):
+    """Column names of an existing dataset, without reading its rows."""
+    fmt = dataset_format(path)
+    if fmt == 'columnar':
+        return _read_schema(path)['columns']
+    if fmt == 'segmented':
+        return read_segment_manifest(path)['columns']
+    if fmt == 'sharded':
+        part_paths = list_shard_paths(path)
+        if not part_paths:
+            raise FileNotFoundError(f"No dataset parts found in: {path}")
+        return dataset_columns(part_paths[0])
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _append_columns(path, df):
+    """
+    Append rows to a columnar dataset in place.
+
+    Three phases, with the schema as the single commit point: the rows'
+    bytes are appended to every column, then the .npy headers get the new
+    row count, then the schema is replaced. Readers only trust the
+    schema's row count (see read_columns), so an interrupted append leaves
+    the old rows readable; its trailing bytes are cut off by the next
+    append. Readers that already mapped the old files keep their view.
+    """
+    schema = _read_schema(path)
+    old_rows = schema['rows']
+    rows = old_rows + len(df)
+
+    # Phase 1: column bytes. A column whose header np.save wrote with
+    # another size is rewritten once beside the original instead
+    dtypes = {}
+    rewritten = []
+    for col in schema['columns']:
+        col_path = os.path.join(path, f'{col}.npy')
+        with open(col_path, 'r+b') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                _, _, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                _, _, dtype = np.lib.format.read_array_header_2_0(f)
+            dtypes[col] = dtype
+            values = df[col].to_numpy(dtype=dtype)
+            if f.tell() == _NPY_HEADER_SIZE:
+                f.truncate(_NPY_HEADER_SIZE + old_rows * dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(values.tobytes())
+                continue
+        old_values = np.load(col_path, mmap_mode='r')[:old_rows]
+        with open(col_path + '.tmp', 'wb') as out:
+            out.write(_npy_header(dtype, rows))
+            out.write(np.ascontiguousarray(old_values).tobytes())
+            out.write(values.tobytes())
+        rewritten.append(col)
+
+    # Phase 2: headers
+    for col in schema['columns']:
+        col_path = os.path.join(path, f'{col}.npy')
+        if col in rewritten:
+            os.replace(col_path + '.tmp', col_path)
+        else:
+            with open(col_path, 'r+b') as f:
+                f.write(_npy_header(dtypes[col], rows))
+
+    # Phase 3: commit
+    _write_schema(path, schema['columns'], rows)
+
+
+def append_dataset(df, path):
+    """
+    Append rows to a dataset without rewriting it.
+
+    CSV files are appended to, columnar columns are extended in place,
+    sharded directories get a new part in the format of the existing
+    parts and segmented stores get a new segment. A path that does not
+    exist yet is created. df must contain the dataset's columns; they are
+    written in the dataset's column order.
+    """
+    if not os.path.exists(path):
+        write_dataset(df, path)
+        return
+    if is_segmented(path):
+        _segment_store(path).append(df)
+        return
+
+    columns = dataset_columns(path)
+    missing = set(columns) - set(df.columns)
+    if missing:
+        raise ValueError(f"Rows to append are missing columns: {sorted(missing)}")
+    df = df[columns]
+
+    fmt = dataset_format(path)
+    if fmt == 'sharded':
+        part_paths = list_shard_paths(path)
+        part_format = 'csv' if part_paths[-1].endswith('.csv') else 'columnar'
+        index = int(os.path.basename(part_paths[-1])[len('part-'):].split('.')[0]) + 1
+        write_dataset(df, shard_path(path, index, part_format), part_format)
+    elif fmt == 'columnar':
+        _append_columns(path, df)
+    else:
+        df.to_csv(path, mode='a', header=False, index=False)
+
+
+def _segment_store(path, create=False):
+    try:
+        from backend.segment_store import SegmentStore
+    except ImportError:  # run as a script from inside backend/
+        from segment_store import SegmentStore
+    return SegmentStore.create(path) if create and not is_segmented(path) else SegmentStore(path)
+
+
+def dataset_stamp(path):
+    """
+    (total bytes, newest mtime_ns) of a dataset's files; changes whenever
+    the dataset is written.
+
+    A segmented store changes only through its manifest (segments are
+    immutable), so only the manifest is checked: segments written by a
+    compaction in progress do not count until they are committed.
+    """
+    paths = [path]
+    if is_segmented(path):
+        paths = [os.path.join(path, SEGMENT_MANIFEST_FILE)]
+    elif os.path.isdir(path):
+        paths = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+    stats = [os.stat(p) for p in paths]
+    return [sum(st.st_size for st in stats), max((st.st_mtime_ns for st in stats), default=0)]
+
+
+def remove_dataset(path):
+    """Delete a CSV file, columnar directory or segmented store."""
+    if is_segmented(path):
+        shutil.rmtree(path)
+    elif is_columnar(path):
+        for col in _read_schema(path)['columns']:
+            os.remove(os.path.join(path, f'{col}.npy'))
+        os.remove(os.path.join(path, SCHEMA_FILE))
+        os.rmdir(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def convert_dataset(src_path, dst_path, file_format=None, chunksize=1_000_000):
+    """
+    Convert between CSV and columnar storage (import/export).
+
+    Data is streamed chunk by chunk, so converting a large dataset only
+    holds one chunk in memory at a time.
+    """
+    writer = open_dataset_writer(dst_path, file_format)
+    for chunk in iter_dataset_chunks(src_path, chunksize):
+        writer.write(chunk)
+    writer.close()
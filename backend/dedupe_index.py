@@ -0,0 +1,234 @@
+# backend/dedupe_index.py
+
+"""
+Persistent (cgpa, iq) index for append-only ingestion.
+
+The index is an open-addressing hash table stored as memory-mapped .npy
+files, mapping each key to the row position of its live (most recent)
+record in the base dataset. Looking up or inserting a batch only touches
+the slots it probes, so the cost scales with the batch rather than the
+dataset.
+
+When a new record replaces an existing key (keep-last), the old row is
+not deleted from the dataset; its position is appended to a superseded
+list that readers drop when loading.
+
+Layout of an index directory:
+
+    meta.json       capacity, live keys, total rows and the dataset stamp
+    cgpa.npy        float64 key column per slot
+    iq.npy          float64 key column per slot
+    rows.npy        int64 row position per slot (-1 = empty)
+    superseded.bin  raw int64 positions of replaced rows, append-only
+"""
+
+import os
+import json
+import shutil
+
+import numpy as np
+
+META_FILE = 'meta.json'
+SUPERSEDED_FILE = 'superseded.bin'
+
+MIN_CAPACITY = 1024
+MAX_LOAD_FACTOR = 0.5
+
+_EMPTY = -1
+
+
+def _hash_slots(cgpa, iq, mask):
+    """Home slot of each key: splitmix64 over the two float64 bit patterns."""
+    with np.errstate(over='ignore'):
+        h = cgpa.view(np.uint64) ^ (iq.view(np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        h = h ^ (h >> np.uint64(31))
+    return (h & np.uint64(mask)).astype(np.int64)
+
+
+class KeyIndex:
+    """
+    On-disk hash index of (cgpa, iq) -> live row position.
+
+    Keys are compared exactly as float64, so callers must pass values
+    already converted to the dataset's storage dtype.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE), 'r') as f:
+            self.meta = json.load(f)
+        self._open_slots()
+
+    def _open_slots(self):
+        self.cgpa = np.load(os.path.join(self.path, 'cgpa.npy'), mmap_mode='r+')
+        self.iq = np.load(os.path.join(self.path, 'iq.npy'), mmap_mode='r+')
+        self.rows = np.load(os.path.join(self.path, 'rows.npy'), mmap_mode='r+')
+
+    @staticmethod
+    def _create_slots(path, capacity):
+        for name, dtype in (('cgpa', np.float64), ('iq', np.float64), ('rows', np.int64)):
+            slots = np.lib.format.open_memmap(
+                os.path.join(path, f'{name}.npy'), mode='w+', dtype=dtype, shape=(capacity,)
+            )
+            slots[:] = _EMPTY if name == 'rows' else 0
+            slots.flush()
+            del slots
+
+    @classmethod
+    def create(cls, path, capacity=MIN_CAPACITY):
+        """Create an empty index directory, replacing any existing one."""
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        capacity = max(MIN_CAPACITY, 1 << (int(capacity) - 1).bit_length())
+        cls._create_slots(path, capacity)
+        open(os.path.join(path, SUPERSEDED_FILE), 'wb').close()
+        with open(os.path.join(path, META_FILE), 'w') as f:
+            json.dump({'capacity': capacity, 'size': 0, 'total_rows': 0, 'stamp': None}, f)
+        return cls(path)
+
+    def matches(self, stamp):
+        """True if the index was last saved against a dataset with this dataset_stamp."""
+        return self.meta['stamp'] == stamp and len(self.rows) == self.meta['capacity']
+
+    @property
+    def size(self):
+        """Number of live keys."""
+        return self.meta['size']
+
+    @property
+    def total_rows(self):
+        """Rows in the dataset, including superseded ones."""
+        return self.meta['total_rows']
+
+    def save_meta(self, total_rows, stamp):
+        """Flush the slots and record the dataset state the index now matches."""
+        self.cgpa.flush()
+        self.iq.flush()
+        self.rows.flush()
+        self.meta['total_rows'] = int(total_rows)
+        self.meta['stamp'] = stamp
+        tmp_path = os.path.join(self.path, META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+
+    def _probe(self, cgpa, iq):
+        """
+        Slot of each key: where it is stored, or the first empty slot on
+        its probe sequence. Returns (slots, found).
+        """
+        mask = self.meta['capacity'] - 1
+        slots = _hash_slots(cgpa + 0.0, iq + 0.0, mask)  # + 0.0 turns -0.0 into 0.0
+        found = np.zeros(len(cgpa), dtype=bool)
+        active = np.arange(len(cgpa))
+        while len(active):
+            s = slots[active]
+            rows = self.rows[s]
+            empty = rows == _EMPTY
+            match = ~empty & (self.cgpa[s] == cgpa[active]) & (self.iq[s] == iq[active])
+            found[active[match]] = True
+            # Linear probing past occupied slots holding other keys
+            active = active[~(empty | match)]
+            slots[active] = (slots[active] + 1) & mask
+        return slots, found
+
+    def lookup(self, cgpa, iq):
+        """Live row position of each key, or -1 where the key is new."""
+        slots, found = self._probe(np.asarray(cgpa, np.float64), np.asarray(iq, np.float64))
+        return np.where(found, self.rows[slots], _EMPTY)
+
+    def upsert(self, cgpa, iq, rows):
+        """
+        Point each key at its new row position.
+
+        Keys must be unique within the batch.
+
+        Returns:
+            ndarray: previous row positions of keys that already existed
+        """
+        cgpa = np.asarray(cgpa, np.float64)
+        iq = np.asarray(iq, np.float64)
+        rows = np.asarray(rows, np.int64)
+        self._reserve(self.size + len(cgpa))
+
+        slots, found = self._probe(cgpa, iq)
+        previous = np.array(self.rows[slots[found]])
+        self.rows[slots[found]] = rows[found]
+
+        # New keys: claim empty slots, re-probing where two keys want the same one
+        mask = self.meta['capacity'] - 1
+        pending = np.flatnonzero(~found)
+        self.meta['size'] += len(pending)
+        while len(pending):
+            s = slots[pending]
+            _, first = np.unique(s, return_index=True)
+            winners = pending[first]
+            self.cgpa[slots[winners]] = cgpa[winners]
+            self.iq[slots[winners]] = iq[winners]
+            self.rows[slots[winners]] = rows[winners]
+
+            # The rest move on to the next empty slot along their probe sequence
+            pending = np.setdiff1d(pending, winners, assume_unique=True)
+            moving = pending
+            while len(moving):
+                slots[moving] = (slots[moving] + 1) & mask
+                moving = moving[self.rows[slots[moving]] != _EMPTY]
+        return previous
+
+    def _reserve(self, n_keys):
+        """Grow (and rehash) the table so n_keys fit under the load factor."""
+        capacity = self.meta['capacity']
+        if n_keys <= capacity * MAX_LOAD_FACTOR:
+            return
+        while n_keys > capacity * MAX_LOAD_FACTOR:
+            capacity *= 2
+
+        occupied = np.flatnonzero(np.asarray(self.rows) != _EMPTY)
+        cgpa = np.array(self.cgpa[occupied])
+        iq = np.array(self.iq[occupied])
+        rows = np.array(self.rows[occupied])
+
+        del self.cgpa, self.iq, self.rows
+        self._create_slots(self.path, capacity)
+        self._open_slots()
+        self.meta['capacity'] = capacity
+        self.meta['size'] = 0
+        self.upsert(cgpa, iq, rows)
+
+    def add_superseded(self, positions):
+        """Record row positions replaced by newer records."""
+        if len(positions):
+            with open(os.path.join(self.path, SUPERSEDED_FILE), 'ab') as f:
+                f.write(np.asarray(positions, dtype=np.int64).tobytes())
+
+    def superseded(self):
+        """Row positions replaced by newer records."""
+        return np.fromfile(os.path.join(self.path, SUPERSEDED_FILE), dtype=np.int64)
+
+    def remap_rows(self, position_map):
+        """
+        Move every stored row position to the dataset's new layout, e.g.
+        after compaction; costs a pass over the slots, not the dataset.
+
+        Args:
+            position_map: Callable mapping old positions to new ones, -1
+                for rows that no longer exist
+
+        Raises:
+            ValueError: if a live key's row no longer exists (the index
+                must be rebuilt)
+        """
+        occupied = np.flatnonzero(np.asarray(self.rows) != _EMPTY)
+        live = position_map(np.asarray(self.rows[occupied]))
+        if (live < 0).any():
+            raise ValueError("Live rows were dropped; the index must be rebuilt")
+        superseded = position_map(self.superseded())
+
+        self.rows[occupied] = live
+        superseded_path = os.path.join(self.path, SUPERSEDED_FILE)
+        with open(superseded_path + '.tmp', 'wb') as f:
+            f.write(superseded[superseded >= 0].tobytes())
+        os.replace(superseded_path + '.tmp', superseded_path)
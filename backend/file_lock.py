@@ -0,0 +1,91 @@
+# backend/file_lock.py
+
+"""
+Cross-process exclusive lock on a lock file.
+
+Uses flock on POSIX and msvcrt.locking on Windows. The lock is released
+by the OS if the holding process dies, so a crash never leaves a stale
+lock behind. Re-acquiring a lock the current thread already holds is a
+no-op, so locked operations can call each other.
+"""
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_held = threading.local()
+
+
+class LockTimeout(Exception):
+    """Raised when a FileLock cannot be acquired within its timeout."""
+
+
+class FileLock:
+    """
+    Exclusive lock on path, usable as a context manager.
+
+    Args:
+        path: Lock file (created if missing)
+        timeout: Seconds to wait; None waits forever, 0 fails immediately
+    """
+
+    def __init__(self, path, timeout=None):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self._file = None
+        self._reentered = False
+
+    def _try_lock(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        held = _held.__dict__.setdefault('paths', set())
+        if self.path in held:
+            self._reentered = True
+            return self
+
+        self._file = open(self.path, 'a+')
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_lock():
+            if deadline is not None and time.monotonic() >= deadline:
+                self._file.close()
+                self._file = None
+                raise LockTimeout(f"Could not acquire lock: {self.path}")
+            time.sleep(0.05)
+        held.add(self.path)
+        return self
+
+    def release(self):
+        if self._reentered:
+            self._reentered = False
+            return
+        if self._file is None:
+            return
+        _held.paths.discard(self.path)
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -6,105 +6,303 @@ Generates 10,000 synthetic training samples and trains the model
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import os
 import sys
 import traceback
 
+try:
+    from backend.dataset_io import (
+        dataset_format, list_shard_paths, open_dataset_writer, read_dataset, remove_dataset, shard_path
+    )
+    from backend.probability_grid import build_probability_grid
+    from backend.model_artifact import save_artifact
+except ImportError:  # run as a script from inside backend/
+    from dataset_io import (
+        dataset_format, list_shard_paths, open_dataset_writer, read_dataset, remove_dataset, shard_path
+    )
+    from probability_grid import build_probability_grid
+    from model_artifact import save_artifact
+
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def _generate_chunk(rng, n):
+    """
+    Generate one chunk of synthetic placement rows as array math.
+    
+    Args:
+        rng: numpy Generator to draw from
+        n: Number of rows in the chunk
+    
+    Returns:
+        DataFrame with cgpa, iq and placement columns
+    """
+    # One draw per chunk. Each row takes three consecutive normals (cgpa, iq,
+    # score noise), so the output does not depend on where chunks split.
+    z = rng.standard_normal((n, 3)).T
+    
+    # CGPA: Normal distribution centered at 6.5
+    cgpa = np.clip(6.5 + 1.3 * z[0], 3.0, 10.0)
+    
+    # IQ: Normal distribution centered at 110
+    iq = np.clip(110 + 20 * z[1], 70, 160)
+    
+    # Placement decision logic
+    cgpa_normalized = (cgpa - 3) / 7
+    iq_normalized = (iq - 70) / 90
+    placement_score = cgpa_normalized * 0.6 + iq_normalized * 0.4 + 0.15 * z[2]
+    
+    return pd.DataFrame({
+        'cgpa': np.round(cgpa, 1),
+        'iq': np.round(iq, 1),
+        'placement': (placement_score > 0.5).astype(np.int64)
+    })
+
+
+def iter_placement_chunks(n_samples, chunk_size=DEFAULT_CHUNK_SIZE, seed=42):
+    """
+    Yield synthetic placement data in chunks of at most chunk_size rows.
+    
+    Args:
+        n_samples: Total number of samples to generate
+        chunk_size: Maximum rows held in memory at once
+        seed: Seed for the numpy Generator
+    
+    Yields:
+        DataFrame chunks with cgpa, iq and placement columns
+    """
+    rng = np.random.default_rng(seed)
+    remaining = n_samples
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        yield _generate_chunk(rng, n)
+        remaining -= n
+
+
+class DatasetStats:
+    """
+    Running statistics over dataset chunks, so large datasets can be
+    summarised without holding every row in memory.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.placed = 0
+        self.sums = {'cgpa': 0.0, 'iq': 0.0}
+        self.sq_sums = {'cgpa': 0.0, 'iq': 0.0}
+        self.mins = {'cgpa': np.inf, 'iq': np.inf}
+        self.maxs = {'cgpa': -np.inf, 'iq': -np.inf}
+        self.placed_sums = {'cgpa': 0.0, 'iq': 0.0}
+    
+    def update(self, chunk):
+        """Fold one chunk into the running statistics."""
+        placed_mask = chunk['placement'].to_numpy() == 1
+        self.total += len(chunk)
+        self.placed += int(placed_mask.sum())
+        for col in ('cgpa', 'iq'):
+            values = chunk[col].to_numpy(dtype=np.float64)
+            self.sums[col] += values.sum()
+            self.sq_sums[col] += np.square(values).sum()
+            self.mins[col] = min(self.mins[col], values.min())
+            self.maxs[col] = max(self.maxs[col], values.max())
+            self.placed_sums[col] += values[placed_mask].sum()
+    
+    def merge(self, other):
+        """Fold another DatasetStats (e.g. from a different chunk stream) into this one."""
+        self.total += other.total
+        self.placed += other.placed
+        for col in ('cgpa', 'iq'):
+            self.sums[col] += other.sums[col]
+            self.sq_sums[col] += other.sq_sums[col]
+            self.mins[col] = min(self.mins[col], other.mins[col])
+            self.maxs[col] = max(self.maxs[col], other.maxs[col])
+            self.placed_sums[col] += other.placed_sums[col]
+        return self
+    
+    def mean(self, col):
+        return self.sums[col] / self.total
+    
+    def std(self, col):
+        # Sample standard deviation, matching pandas' default ddof=1
+        if self.total < 2:
+            return 0.0
+        variance = (self.sq_sums[col] - self.sums[col] ** 2 / self.total) / (self.total - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+    
+    def group_mean(self, col, placed):
+        if placed:
+            count, total = self.placed, self.placed_sums[col]
+        else:
+            count, total = self.total - self.placed, self.sums[col] - self.placed_sums[col]
+        return total / count if count else float('nan')
+    
+    def print_summary(self):
+        """Print the dataset statistics report."""
+        print(f"\n{'='*60}")
+        print("DATASET STATISTICS")
+        print(f"{'='*60}")
+        print(f"Total samples: {self.total}")
+        if self.total == 0:
+            print(f"{'='*60}\n")
+            return
+        print(f"Placement rate: {self.placed / self.total:.1%}")
+        print(f"\nCGPA Statistics:")
+        print(f"  Mean: {self.mean('cgpa'):.2f}")
+        print(f"  Std: {self.std('cgpa'):.2f}")
+        print(f"  Range: {self.mins['cgpa']:.1f} - {self.maxs['cgpa']:.1f}")
+        print(f"\nIQ Statistics:")
+        print(f"  Mean: {self.mean('iq'):.2f}")
+        print(f"  Std: {self.std('iq'):.2f}")
+        print(f"  Range: {self.mins['iq']:.1f} - {self.maxs['iq']:.1f}")
+        
+        print(f"\nPlacement Breakdown:")
+        print(f"  Placed: {self.placed} students")
+        print(f"  Not Placed: {self.total - self.placed} students")
+        print(f"\nAverage Metrics:")
+        print(f"  Placed - CGPA: {self.group_mean('cgpa', True):.2f}, IQ: {self.group_mean('iq', True):.2f}")
+        print(f"  Not Placed - CGPA: {self.group_mean('cgpa', False):.2f}, IQ: {self.group_mean('iq', False):.2f}")
+        print(f"{'='*60}\n")
+
 
-def generate_placement_dataset(n_samples=10000, save_path='placement-dataset.csv'):
+def generate_placement_dataset(n_samples=10000, save_path='placement-dataset.csv',
+                               chunk_size=DEFAULT_CHUNK_SIZE, seed=42, return_df=True,
+                               file_format=None):
     """
     Generate synthetic placement data based on realistic patterns.
     
+    Rows are generated chunk by chunk and streamed to save_path, so peak
+    memory is bounded by chunk_size rather than n_samples (unless the
+    full DataFrame is requested back with return_df).
+    
     Args:
         n_samples: Number of samples to generate
-        save_path: Path to save the CSV file
+        save_path: Path to save the CSV file or columnar directory
+        chunk_size: Maximum rows generated and held in memory at once
+        seed: Seed for the numpy Generator
+        return_df: Return the full DataFrame; pass False for large datasets
+        file_format: 'csv' or 'columnar' (default: inferred from save_path)
     
     Returns:
-        DataFrame with generated data
+        DataFrame with generated data, or DatasetStats when return_df is False
     """
     print(f"Generating {n_samples} samples...")
-    np.random.seed(42)
     
-    data = []
+    kept_chunks = [] if return_df else None
+    stats = _write_chunks(
+        iter_placement_chunks(n_samples, chunk_size, seed), save_path, n_samples,
+        file_format or dataset_format(save_path), kept_chunks
+    )
     
-    for i in range(n_samples):
-        if (i + 1) % 1000 == 0:
-            print(f"  Generated {i + 1}/{n_samples} samples...")
-        
-        # Generate CGPA: Normal distribution centered at 6.5
-        cgpa = np.random.normal(loc=6.5, scale=1.3)
-        cgpa = np.clip(cgpa, 3.0, 10.0)
-        
-        # Generate IQ: Normal distribution centered at 110
-        iq = np.random.normal(loc=110, scale=20)
-        iq = np.clip(iq, 70, 160)
-        
-        # Placement decision logic
-        cgpa_normalized = (cgpa - 3) / 7
-        iq_normalized = (iq - 70) / 90
-        
-        placement_score = (
-            cgpa_normalized * 0.6 + 
-            iq_normalized * 0.4 + 
-            np.random.normal(0, 0.15)
-        )
-        
-        placed = 1 if placement_score > 0.5 else 0
-        
-        data.append({
-            'cgpa': round(cgpa, 1),
-            'iq': round(iq, 1),
-            'placement': placed
-        })
+    stats.print_summary()
+    print(f"Dataset saved to: {save_path}")
     
-    df = pd.DataFrame(data)
+    if return_df:
+        return pd.concat(kept_chunks, ignore_index=True)
+    return stats
+
+
+def _write_chunks(chunks, save_path, n_samples, file_format='csv', kept_chunks=None):
+    """Stream DataFrame chunks into one CSV file or columnar directory and return their DatasetStats."""
+    stats = DatasetStats()
+    writer = open_dataset_writer(save_path, file_format)
+    for chunk in chunks:
+        writer.write(chunk)
+        stats.update(chunk)
+        if kept_chunks is not None:
+            kept_chunks.append(chunk)
+        print(f"  Generated {stats.total}/{n_samples} samples...")
+    if stats.total == 0:
+        # Still write the columns, so the output reads back as an empty dataset
+        empty = _generate_chunk(np.random.default_rng(), 0)
+        writer.write(empty)
+        if kept_chunks is not None:
+            kept_chunks.append(empty)
+    writer.close()
+    return stats
+
+
+def _generate_shard(task):
+    """Process-pool worker: generate one shard and write it to its part file."""
+    shard_index, n_rows, seed_seq, out_dir, chunk_size, file_format = task
+    path = shard_path(out_dir, shard_index, file_format)
+    stats = _write_chunks(iter_placement_chunks(n_rows, chunk_size, seed_seq), path, n_rows, file_format)
+    return path, stats
+
+
+def generate_placement_dataset_sharded(n_samples=10000, out_dir='placement-dataset',
+                                       n_shards=None, n_workers=None,
+                                       chunk_size=DEFAULT_CHUNK_SIZE, seed=42, file_format='csv'):
+    """
+    Generate synthetic placement data as part files across a process pool.
     
-    # Print statistics
-    print(f"\n{'='*60}")
-    print("DATASET STATISTICS")
-    print(f"{'='*60}")
-    print(f"Total samples: {len(df)}")
-    print(f"Placement rate: {df['placement'].mean():.1%}")
-    print(f"\nCGPA Statistics:")
-    print(f"  Mean: {df['cgpa'].mean():.2f}")
-    print(f"  Std: {df['cgpa'].std():.2f}")
-    print(f"  Range: {df['cgpa'].min():.1f} - {df['cgpa'].max():.1f}")
-    print(f"\nIQ Statistics:")
-    print(f"  Mean: {df['iq'].mean():.2f}")
-    print(f"  Std: {df['iq'].std():.2f}")
-    print(f"  Range: {df['iq'].min():.1f} - {df['iq'].max():.1f}")
-    
-    placed_df = df[df['placement'] == 1]
-    not_placed_df = df[df['placement'] == 0]
-    
-    print(f"\nPlacement Breakdown:")
-    print(f"  Placed: {len(placed_df)} students")
-    print(f"  Not Placed: {len(not_placed_df)} students")
-    print(f"\nAverage Metrics:")
-    print(f"  Placed - CGPA: {placed_df['cgpa'].mean():.2f}, IQ: {placed_df['iq'].mean():.2f}")
-    print(f"  Not Placed - CGPA: {not_placed_df['cgpa'].mean():.2f}, IQ: {not_placed_df['iq'].mean():.2f}")
-    print(f"{'='*60}\n")
+    Each shard draws from its own Generator seeded by
+    SeedSequence(seed).spawn(n_shards), and shard sizes depend only on
+    n_samples and n_shards. The combined dataset is therefore identical
+    for any n_workers. The output directory can be passed directly as
+    AutoRetrainer's base_dataset_path.
     
-    # Save to CSV
-    df.to_csv(save_path, index=False)
-    print(f"Dataset saved to: {save_path}")
+    On platforms that spawn worker processes (Windows, macOS) call this
+    from under an ``if __name__ == "__main__":`` guard.
+    
+    Args:
+        n_samples: Total number of samples to generate
+        out_dir: Directory to write the part files into
+        n_shards: Number of part files (defaults to the CPU count)
+        n_workers: Worker processes (defaults to min(n_shards, CPU count))
+        chunk_size: Maximum rows held in memory per worker
+        seed: Root seed the per-shard seeds are spawned from
+        file_format: Part format, 'csv' or 'columnar'
+    
+    Returns:
+        DatasetStats for the combined dataset
+    """
+    n_shards = n_shards or os.cpu_count() or 1
+    n_workers = n_workers or min(n_shards, os.cpu_count() or 1)
+    
+    print(f"Generating {n_samples} samples in {n_shards} shards ({n_workers} workers)...")
+    
+    os.makedirs(out_dir, exist_ok=True)
+    # Stale parts from a previous run with more shards would leak into the dataset
+    for old_path in list_shard_paths(out_dir):
+        remove_dataset(old_path)
+    
+    base, extra = divmod(n_samples, n_shards)
+    shard_sizes = [base + (1 if i < extra else 0) for i in range(n_shards)]
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    tasks = [
+        (i, shard_sizes[i], seeds[i], out_dir, chunk_size, file_format)
+        for i in range(n_shards) if shard_sizes[i] > 0
+    ]
+    
+    stats = DatasetStats()
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        for path, shard_stats in pool.map(_generate_shard, tasks):
+            stats.merge(shard_stats)
+    
+    stats.print_summary()
+    print(f"Dataset shards saved to: {out_dir}")
     
-    return df
+    return stats
 
 
-def train_initial_model(dataset_path='placement-dataset.csv', model_path='placement_model.pkl'):
+def train_initial_model(dataset_path='placement-dataset.csv', model_path='placement_model.pkl',
+                        artifact_format='pickle'):
     """
     Train the placement prediction model.
     
     Args:
-        dataset_path: Path to the dataset CSV
+        dataset_path: Path to the dataset (CSV, columnar or sharded)
         model_path: Path to save the trained model
+        artifact_format: 'pickle' (.pkl file) or 'mmap' (directory of
+            memory-mappable arrays shared across serving processes)
     """
     try:
         from sklearn.model_selection import train_test_split
         from sklearn.linear_model import LogisticRegression
         from sklearn.preprocessing import StandardScaler
         from sklearn.metrics import classification_report, accuracy_score
-        import joblib
     except ImportError as e:
         print(f"\nERROR: Missing required library!")
         print(f"Please install: pip install scikit-learn")
@@ -112,7 +310,7 @@ def train_initial_model(dataset_path='placement-dataset.csv', model_path='placem
         sys.exit(1)
     
     print("\nLoading dataset...")
-    df = pd.read_csv(dataset_path)
+    df = read_dataset(dataset_path)
     
     X = df[['cgpa', 'iq']]
     y = df['placement']
@@ -150,11 +348,11 @@ def train_initial_model(dataset_path='placement-dataset.csv', model_path='placem
         'model': model,
         'scaler': scaler,
         'accuracy': accuracy,
-        'train_samples': len(X_train)
+        'train_samples': len(X_train),
+        'probability_grid': build_probability_grid(model, scaler)
     }
     
-    import joblib
-    joblib.dump(model_data, model_path)
+    save_artifact(model_data, model_path, artifact_format)
     print(f"Model saved to: {model_path}\n")
     
     return model, scaler, accuracy
@@ -188,7 +386,7 @@ def main():
         # Step 1: Generate dataset
         print("STEP 1: Generating training data...")
         print("-" * 60)
-        df = generate_placement_dataset(n_samples=10000, save_path=dataset_path)
+        generate_placement_dataset(n_samples=10000, save_path=dataset_path, return_df=False)
         
         # Step 2: Train model
         print("\nSTEP 2: Training model...")
@@ -0,0 +1,331 @@
+# backend/inference_service.py
+
+"""
+Local inference service with dynamic micro-batching.
+
+Concurrent single-student requests are queued for up to max_wait_ms and
+scored together with one predict_placement_batch call (up to
+max_batch_size at a time), which is far cheaper under load than one
+model invocation per request.
+
+Run over TCP or a Unix socket:
+
+    python -m backend.inference_service --port 8765
+    python -m backend.inference_service --unix-socket /tmp/placement.sock
+
+Endpoints (JSON over HTTP/1.1, keep-alive supported):
+
+    POST /predict   {"cgpa": 7.5, "iq": 120}
+                    -> {"prediction": 1, "probability": 0.81, "key_factor": "CGPA"}
+    GET  /stats     latency p50/p99 and the batch-size histogram
+    GET  /health    {"status": "ok"}
+
+InferenceClient gives the app and agent a drop-in predict_placement.
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import socket
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from backend.tools import predict_placement_batch
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 2.0
+
+# Latencies kept for the percentile report
+LATENCY_WINDOW = 10000
+
+
+# -----------------------------
+# Micro-batching
+# -----------------------------
+class MicroBatcher:
+    """
+    Collects concurrent predictions into batches.
+
+    The first queued request opens a batch; it is scored once
+    max_batch_size requests are waiting or max_wait_ms has passed,
+    whichever comes first.
+    """
+
+    def __init__(self, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, cgpa, iq):
+        """Queue one prediction and wait for its batch to be scored."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((float(cgpa), float(iq), future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            cgpas = [item[0] for item in batch]
+            iqs = [item[1] for item in batch]
+            try:
+                # Scoring runs off the event loop so new requests keep queueing
+                predictions, probabilities, key_factors = await loop.run_in_executor(
+                    None, predict_placement_batch, cgpas, iqs
+                )
+            except Exception as e:
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            self.batch_sizes[len(batch)] += 1
+            self.requests += len(batch)
+            for i, (_, _, future, enqueued) in enumerate(batch):
+                self.latencies.append(now - enqueued)
+                if not future.done():
+                    future.set_result({
+                        'prediction': int(predictions[i]),
+                        'probability': float(probabilities[i]),
+                        'key_factor': str(key_factors[i]),
+                    })
+
+    def stats(self):
+        """Latency percentiles (ms) and the batch-size histogram."""
+        latencies_ms = np.array(self.latencies) * 1000.0
+        histogram = Counter()
+        for size, count in self.batch_sizes.items():
+            # Power-of-two buckets: 1, 2, 4, 8, ...
+            histogram[1 << (size - 1).bit_length()] += count
+        return {
+            'requests': self.requests,
+            'batches': sum(self.batch_sizes.values()),
+            'latency_ms': {
+                'p50': float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+                'p99': float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else None,
+                'max': float(latencies_ms.max()) if len(latencies_ms) else None,
+            },
+            'batch_size_histogram': {f'<={bucket}': histogram[bucket] for bucket in sorted(histogram)},
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+        }
+
+
+# -----------------------------
+# HTTP server
+# -----------------------------
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload).encode('utf-8')
+    headers = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return headers.encode('latin1') + body
+
+
+async def _read_request(reader):
+    """Parse one HTTP request; returns (method, path, headers, body) or None at EOF."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode('latin1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+
+async def _handle(batcher, method, path, body):
+    if method == 'POST' and path == '/predict':
+        try:
+            request = json.loads(body)
+            cgpa, iq = float(request['cgpa']), float(request['iq'])
+        except (ValueError, KeyError, TypeError):
+            return 400, {'error': 'Body must be JSON with numeric cgpa and iq'}
+        return 200, await batcher.predict(cgpa, iq)
+    if method == 'GET' and path == '/stats':
+        return 200, batcher.stats()
+    if method == 'GET' and path == '/health':
+        return 200, {'status': 'ok'}
+    return 404, {'error': f'No route for {method} {path}'}
+
+
+def _connection_handler(batcher):
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                try:
+                    status, payload = await _handle(batcher, method, path, body)
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle_connection
+
+
+async def serve(host='127.0.0.1', port=8765, unix_socket=None,
+                max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    """Run the inference service until cancelled."""
+    batcher = MicroBatcher(max_batch_size, max_wait_ms)
+    batcher.start()
+    handler = _connection_handler(batcher)
+
+    if unix_socket:
+        server = await asyncio.start_unix_server(handler, path=unix_socket)
+        where = unix_socket
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        where = f"http://{host}:{port}"
+
+    print(f"Inference service listening on {where} "
+          f"(max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+# -----------------------------
+# Client
+# -----------------------------
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=10):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class InferenceClient:
+    """
+    Blocking client for the inference service, keeping one connection open.
+
+    predict_placement has the same signature and return value as
+    backend.tools.predict_placement. Not thread-safe; use one client per
+    thread.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, unix_socket=None, timeout=10):
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.timeout = timeout
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            if self.unix_socket:
+                self._conn = _UnixHTTPConnection(self.unix_socket, self.timeout)
+            else:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload) if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read())
+                break
+            except (ConnectionError, http.client.HTTPException):
+                # The server may have closed an idle keep-alive connection
+                self.close()
+                if attempt == 1:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(f"Inference service error {response.status}: {data.get('error')}")
+        return data
+
+    def predict_placement(self, cgpa, iq):
+        """Returns (prediction, probability, key_influence_factor)."""
+        result = self._request('POST', '/predict', {'cgpa': cgpa, 'iq': iq})
+        return result['prediction'], result['probability'], result['key_factor']
+
+    def stats(self):
+        return self._request('GET', '/stats')
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Placement inference service with micro-batching")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix-socket', default=None, help="Listen on this Unix socket instead of TCP")
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.max_batch_size, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# backend/metrics.py
+
+"""
+Low-overhead counters and latency histograms, exported in the Prometheus
+text format.
+
+Metrics are off unless PLACEMENT_METRICS=1 is set in the environment
+before the backend modules are imported. When off, the @timed decorator
+returns the undecorated function, so instrumented functions run exactly
+as before, and the few inline observations are skipped behind a single
+``if metrics.ENABLED`` check.
+
+When on, the metrics can be exported by setting:
+
+    PLACEMENT_METRICS_FILE=/path/metrics.prom   rewritten every
+                                                PLACEMENT_METRICS_INTERVAL
+                                                seconds (default 15) and at exit,
+                                                e.g. for node_exporter's
+                                                textfile collector
+    PLACEMENT_METRICS_PORT=9108                 served at http://host:port/metrics
+
+or programmatically with write_metrics_file / start_http_exporter.
+"""
+
+import atexit
+import bisect
+import functools
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get('PLACEMENT_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Latency buckets in seconds, from sub-millisecond predictions to full retrains
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _label_key(label_names, labels):
+    return tuple(str(labels[name]) for name in label_names)
+
+
+def _format_labels(label_names, key, extra=None):
+    pairs = [f'{name}="{value}"' for name, value in zip(label_names, key)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic counter, one series per label combination."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.label_names, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f'{self.name}{_format_labels(self.label_names, key)} {value}'
+                for key, value in sorted(values.items())]
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, one series per label combination."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = _label_key(self.label_names, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), sum, count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(counts), total, count)
+                      for key, (counts, total, count) in self._series.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.label_names, key)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(self.label_names, key)} {count}')
+        return lines
+
+
+def timed(histogram, label_from_result=None, **labels):
+    """
+    Decorator recording the wall time of each call in histogram.
+
+    Args:
+        histogram: Histogram to observe into
+        label_from_result: Optional (label_name, func) pair; func(result)
+            gives that label's value, e.g. the agent branch taken
+        **labels: Fixed label values
+
+    When metrics are disabled the function is returned unchanged.
+    """
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            if label_from_result is None:
+                histogram.observe(elapsed, **labels)
+            else:
+                name, get_label = label_from_result
+                histogram.observe(elapsed, **labels, **{name: get_label(result)})
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# -----------------------------
+# Metrics
+# -----------------------------
+PREDICT_SECONDS = Histogram(
+    'placement_predict_seconds', 'Latency of prediction calls.', ['function']
+)
+BULK_ROWS = Counter(
+    'placement_bulk_rows_total', 'Rows scored by bulk prediction.', ['function']
+)
+AGENT_SECONDS = Histogram(
+    'placement_agent_seconds', 'Latency of create_agent calls by branch.', ['branch']
+)
+RETRAIN_STAGE_SECONDS = Histogram(
+    'placement_retrain_stage_seconds', 'Duration of AutoRetrainer.retrain stages.', ['stage', 'model']
+)
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics_file(path):
+    """Write the metrics to path atomically (temp file + os.replace)."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(render_prometheus())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def start_file_exporter(path, interval=15.0):
+    """Rewrite the metrics file every interval seconds and once more at exit."""
+    def run():
+        while True:
+            time.sleep(interval)
+            write_metrics_file(path)
+
+    threading.Thread(target=run, name='metrics-file-exporter', daemon=True).start()
+    atexit.register(write_metrics_file, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_exporter(port, host='127.0.0.1'):
+    """Serve /metrics from a background thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http-exporter', daemon=True).start()
+    return server
+
+
+if ENABLED:
+    if os.environ.get('PLACEMENT_METRICS_FILE'):
+        start_file_exporter(os.environ['PLACEMENT_METRICS_FILE'],
+                            float(os.environ.get('PLACEMENT_METRICS_INTERVAL', 15)))
+    if os.environ.get('PLACEMENT_METRICS_PORT'):
+        start_http_exporter(int(os.environ['PLACEMENT_METRICS_PORT']))
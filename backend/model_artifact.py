@@ -0,0 +1,375 @@
+# backend/model_artifact.py
+
+"""
+Model artifact formats.
+
+'pickle' is the original single-file joblib .pkl dict.
+
+'mmap' is a directory meant to be shared by many serving processes:
+
+    meta.pkl        small joblib dict: scaler, metrics, version, grid
+                    domain and either the sklearn model (linear or
+                    unsupported models) or the compiled ensemble metadata
+    *.npy           large arrays: the probability grid and, for
+                    RandomForest/GradientBoosting, every tree's nodes
+                    flattened into shared arrays
+    estimator.pkl   the compiled ensemble's sklearn estimator, for
+                    retraining (warm start) only; serving never loads it
+
+The .npy files are opened with np.load(mmap_mode='r') and tree ensembles
+are evaluated directly from them, so N processes share one page-cache
+copy instead of each unpickling sklearn Tree objects (which copy their
+node arrays into private memory on load).
+
+Run this module to compare per-worker memory of the two formats:
+
+    python backend/model_artifact.py <artifact> [n_workers]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+import joblib
+import numpy as np
+
+META_FILE = 'meta.pkl'
+ESTIMATOR_FILE = 'estimator.pkl'
+
+# Rows per traversal batch, bounding the (n_trees, batch) node-index matrix
+_TRAVERSAL_BATCH = 8192
+
+
+def _read_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once: os.umask can only be read by setting it, which races other threads
+_UMASK = _read_umask()
+
+
+def make_readable(path):
+    """
+    Give a temp file (0600) or directory (0700) from tempfile the mode a
+    plain open() or os.makedirs() would have, so processes running as
+    other users can read it once it is moved into place.
+    """
+    mode = 0o777 if os.path.isdir(path) else 0o666
+    os.chmod(path, mode & ~_UMASK)
+
+
+# -----------------------------
+# Compiled tree ensembles
+# -----------------------------
+class TreeEnsembleEvaluator:
+    """
+    Read-only RandomForest / GradientBoosting evaluator over flat arrays.
+
+    Quacks like a fitted binary sklearn classifier (classes_,
+    predict_proba, predict) so the rest of the serving code can use it
+    unchanged. Results match the sklearn estimator it was compiled from.
+    """
+
+    def __init__(self, arrays, meta):
+        self.left = arrays['tree_left']
+        self.right = arrays['tree_right']
+        self.feature = arrays['tree_feature']
+        self.threshold = arrays['tree_threshold']
+        self.leaf_value = arrays['tree_value']
+        self.roots = arrays['tree_roots']
+        self.kind = meta['kind']
+        self.max_depth = meta['max_depth']
+        self.learning_rate = meta.get('learning_rate', 1.0)
+        self.init_raw = meta.get('init_raw', 0.0)
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = meta['n_features']
+
+    def _leaf_values(self, X):
+        """(n_trees, n_samples) leaf values reached by each sample in each tree."""
+        n_samples = X.shape[0]
+        nodes = np.repeat(np.asarray(self.roots, dtype=np.int64)[:, None], n_samples, axis=1)
+        rows = np.arange(n_samples)[None, :]
+        for _ in range(self.max_depth):
+            left = self.left[nodes]
+            is_leaf = left < 0
+            if is_leaf.all():
+                break
+            features = np.where(is_leaf, 0, self.feature[nodes])
+            go_left = X[rows, features] <= self.threshold[nodes]
+            nodes = np.where(is_leaf, nodes, np.where(go_left, left, self.right[nodes]))
+        return self.leaf_value[nodes]
+
+    def _positive_proba(self, X):
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], _TRAVERSAL_BATCH):
+            values = self._leaf_values(X[start:start + _TRAVERSAL_BATCH])
+            if self.kind == 'forest':
+                out[start:start + _TRAVERSAL_BATCH] = values.mean(axis=0)
+            else:
+                raw = self.init_raw + self.learning_rate * values.sum(axis=0)
+                out[start:start + _TRAVERSAL_BATCH] = np.exp(-np.logaddexp(0.0, -raw))
+        return out
+
+    def predict_proba(self, X):
+        p = self._positive_proba(X)
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return (self._positive_proba(X) > 0.5).astype(np.int64)
+
+
+def compile_tree_ensemble(model):
+    """
+    Flatten a binary RandomForestClassifier or GradientBoostingClassifier.
+
+    Returns:
+        (arrays, meta) for TreeEnsembleEvaluator, or None for other models
+    """
+    from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+
+    if type(model) is RandomForestClassifier and list(model.classes_) == [0, 1]:
+        kind, trees, meta = 'forest', [e.tree_ for e in model.estimators_], {}
+    elif (type(model) is GradientBoostingClassifier and list(model.classes_) == [0, 1]
+          and model.estimators_.shape[1] == 1):
+        try:
+            init_raw = float(model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0])
+        except Exception:
+            return None
+        kind, trees = 'gboost', [e.tree_ for e in model.estimators_[:, 0]]
+        meta = {'learning_rate': float(model.learning_rate), 'init_raw': init_raw}
+    else:
+        return None
+
+    lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        leaf = left < 0
+        lefts.append(np.where(leaf, -1, left + offset))
+        rights.append(np.where(leaf, -1, right + offset))
+        features.append(tree.feature.astype(np.int32))
+        thresholds.append(tree.threshold.astype(np.float64))
+        if kind == 'forest':
+            counts = tree.value[:, 0, :]
+            values.append(counts[:, 1] / counts.sum(axis=1))
+        else:
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+        roots.append(offset)
+        offset += tree.node_count
+
+    arrays = {
+        'tree_left': np.concatenate(lefts).astype(np.int32),
+        'tree_right': np.concatenate(rights).astype(np.int32),
+        'tree_feature': np.concatenate(features),
+        'tree_threshold': np.concatenate(thresholds),
+        'tree_value': np.concatenate(values),
+        'tree_roots': np.asarray(roots, dtype=np.int32),
+    }
+    meta.update({
+        'kind': kind,
+        'max_depth': int(max(tree.max_depth for tree in trees)) + 1,
+        'n_features': int(model.n_features_in_),
+    })
+    return arrays, meta
+
+
+# -----------------------------
+# Save / load
+# -----------------------------
+def is_mmap_artifact(path):
+    """True if path is an 'mmap' format artifact directory."""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+def artifact_stamp_path(path):
+    """The file whose mtime/size identifies an artifact version."""
+    return os.path.join(path, META_FILE) if os.path.isdir(path) else path
+
+
+def _save_mmap_dir(model_data, path):
+    meta = dict(model_data) if isinstance(model_data, dict) else {'model': model_data}
+    arrays = {}
+
+    grid = meta.get('probability_grid')
+    if grid is not None:
+        grid = dict(grid)
+        arrays['grid'] = np.ascontiguousarray(grid.pop('probabilities'))
+        meta['probability_grid'] = grid
+
+    compiled = compile_tree_ensemble(meta.get('model'))
+    if compiled is not None:
+        tree_arrays, compiled_meta = compiled
+        arrays.update(tree_arrays)
+        meta['compiled_model'] = compiled_meta
+        meta['model'] = None
+        os.makedirs(path, exist_ok=True)
+        joblib.dump(model_data['model'], os.path.join(path, ESTIMATOR_FILE))
+
+    os.makedirs(path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), array)
+    meta['array_names'] = sorted(arrays)
+    joblib.dump(meta, os.path.join(path, META_FILE))
+
+
+def save_artifact(model_data, path, artifact_format='pickle'):
+    """
+    Write a model artifact atomically.
+
+    The artifact is written under a temporary name in the same directory
+    and moved into place, so readers never see a partial artifact.
+
+    Args:
+        model_data: Artifact dict (model, scaler, metrics, grid, ...)
+        path: Destination .pkl file ('pickle') or directory ('mmap')
+        artifact_format: 'pickle' or 'mmap'
+    """
+    parent = os.path.dirname(path) or '.'
+    if artifact_format == 'pickle':
+        fd, tmp_path = tempfile.mkstemp(dir=parent, prefix='.tmp-', suffix='.pkl')
+        os.close(fd)
+        try:
+            joblib.dump(model_data, tmp_path)
+            make_readable(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return
+
+    if artifact_format != 'mmap':
+        raise ValueError(f"Unknown artifact format: {artifact_format}")
+
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    try:
+        _save_mmap_dir(model_data, tmp_dir)
+        make_readable(tmp_dir)
+        if os.path.isdir(path):
+            # A directory cannot replace a non-empty one atomically; move the
+            # old one aside first (readers retry on the next reload check)
+            old_dir = tempfile.mkdtemp(dir=parent, prefix='.old-')
+            os.replace(path, os.path.join(old_dir, 'artifact'))
+            os.replace(tmp_dir, path)
+            shutil.rmtree(old_dir)
+        else:
+            os.replace(tmp_dir, path)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def load_artifact(path, mmap=True, estimator=False):
+    """
+    Load a model artifact in either format as the model .pkl dict.
+
+    For 'mmap' artifacts the large arrays are memory-mapped read-only and
+    a compiled tree ensemble is returned as a TreeEnsembleEvaluator under
+    'model'. For 'pickle' artifacts, mmap maps the arrays joblib stored
+    inside the pickle.
+
+    Args:
+        path: Artifact .pkl file or 'mmap' directory
+        mmap: Memory-map the large arrays read-only
+        estimator: Return a compiled ensemble's sklearn estimator under
+            'model' instead of the evaluator, e.g. to retrain it
+    """
+    if not os.path.isdir(path):
+        return joblib.load(path, mmap_mode='r' if mmap else None)
+
+    meta = joblib.load(os.path.join(path, META_FILE))
+    mmap_mode = 'r' if mmap else None
+    arrays = {
+        name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+        for name in meta.pop('array_names', [])
+    }
+
+    if meta.get('probability_grid') is not None:
+        meta['probability_grid'] = dict(meta['probability_grid'], probabilities=arrays['grid'])
+    compiled_meta = meta.pop('compiled_model', None)
+    estimator_path = os.path.join(path, ESTIMATOR_FILE)
+    if compiled_meta is not None and estimator and os.path.exists(estimator_path):
+        meta['model'] = joblib.load(estimator_path)
+    elif compiled_meta is not None:
+        meta['model'] = TreeEnsembleEvaluator(arrays, compiled_meta)
+    return meta
+
+
+def remove_artifact(path):
+    """Delete an artifact in either format."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+# -----------------------------
+# Memory report
+# -----------------------------
+def memory_usage_kb():
+    """
+    Resident (RSS), proportional (PSS) and private (USS) memory of this
+    process in kB.
+
+    PSS divides shared pages between the processes mapping them and USS
+    counts only pages no other process shares, so together they show what
+    a worker really costs. Linux only; returns None elsewhere.
+    """
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return None
+    return {
+        'rss_kb': int(fields['Rss'].split()[0]),
+        'pss_kb': int(fields['Pss'].split()[0]),
+        'uss_kb': int(fields['Private_Clean'].split()[0]) + int(fields['Private_Dirty'].split()[0]),
+    }
+
+
+def _memory_probe(path):
+    import time
+    # Import the libraries first so "before" is the bare serving baseline
+    import sklearn.ensemble, sklearn.linear_model, sklearn.preprocessing  # noqa: F401
+    before = memory_usage_kb()
+    loaded = load_artifact(path, mmap=True)
+    model = loaded['model'] if isinstance(loaded, dict) else loaded
+    # Touch the model so mapped pages are actually faulted in
+    model.predict_proba(np.zeros((1, 2)))
+    time.sleep(1.0)  # let sibling workers map the same pages
+    after = memory_usage_kb()
+    return before, after
+
+
+def report_worker_memory(path, n_workers=4):
+    """
+    Load an artifact in n_workers processes and print RSS/USS per worker
+    before and after loading.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        results = list(pool.map(_memory_probe, [path] * n_workers))
+
+    print(f"Artifact: {path}")
+    print(f"{'worker':>6} | {'RSS before':>10} | {'RSS after':>10} | {'USS before':>10} | {'USS after':>10}")
+    for i, (before, after) in enumerate(results):
+        if before is None:
+            print("Memory report needs /proc/self/smaps_rollup (Linux)")
+            return results
+        print(f"{i:>6} | {before['rss_kb']:>8}kB | {after['rss_kb']:>8}kB | "
+              f"{before['uss_kb']:>8}kB | {after['uss_kb']:>8}kB")
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python backend/model_artifact.py <artifact> [n_workers]")
+        sys.exit(1)
+    report_worker_memory(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 4)
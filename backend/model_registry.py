@@ -0,0 +1,195 @@
+# backend/model_registry.py
+
+"""
+Versioned model registry.
+
+Layout of a registry directory:
+
+    manifest.json          every retained version with its metrics,
+                           dataset fingerprint and artifact path
+    CURRENT                relative path of the active artifact
+    models/placement_model_v<N>.pkl   ('pickle' artifacts)
+    models/placement_model_v<N>.mmap  ('mmap' artifact directories)
+
+Artifacts are never modified once published. Every file is written to a
+temporary name and moved into place with os.replace, so readers see
+either the old or the new state and never a missing or half-written
+file. Serving processes resolve the active model by reading CURRENT
+(one small file), without parsing the manifest or scanning the directory.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    from backend.model_artifact import make_readable, remove_artifact, save_artifact
+except ImportError:  # run as a script from inside backend/
+    from model_artifact import make_readable, remove_artifact, save_artifact
+
+MANIFEST_FILE = 'manifest.json'
+CURRENT_FILE = 'CURRENT'
+MODELS_DIR = 'models'
+
+
+def _atomic_write_text(path, text):
+    """Write text to path via a temp file in the same directory and os.replace."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        make_readable(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def dataset_fingerprint(df):
+    """Content hash of the cgpa/iq/placement rows a model was trained on."""
+    row_hashes = pd.util.hash_pandas_object(df[['cgpa', 'iq', 'placement']], index=False)
+    return hashlib.sha1(row_hashes.to_numpy().tobytes()).hexdigest()
+
+
+def resolve_current(registry_dir):
+    """
+    Absolute path of the registry's current artifact, or None if the
+    registry has nothing published.
+    """
+    try:
+        with open(os.path.join(registry_dir, CURRENT_FILE), 'r') as f:
+            relative_path = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(registry_dir, relative_path) if relative_path else None
+
+
+class ModelRegistry:
+    """
+    Publishes, lists and prunes versioned model artifacts.
+    """
+
+    def __init__(self, registry_dir, keep_versions=5):
+        self.registry_dir = registry_dir
+        self.keep_versions = keep_versions
+        os.makedirs(os.path.join(registry_dir, MODELS_DIR), exist_ok=True)
+
+    def load_manifest(self):
+        """The manifest dict ({'current': version, 'versions': [...]})."""
+        path = os.path.join(self.registry_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {'current': None, 'versions': []}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest):
+        _atomic_write_text(
+            os.path.join(self.registry_dir, MANIFEST_FILE), json.dumps(manifest, indent=2)
+        )
+
+    def current_path(self):
+        """Absolute path of the current artifact, or None."""
+        return resolve_current(self.registry_dir)
+
+    def current_entry(self):
+        """Manifest entry of the current version, or None."""
+        manifest = self.load_manifest()
+        return self.get_entry(manifest['current'], manifest)
+
+    def get_entry(self, version, manifest=None):
+        manifest = manifest or self.load_manifest()
+        for entry in manifest['versions']:
+            if entry['version'] == version:
+                return entry
+        return None
+
+    def next_version(self):
+        manifest = self.load_manifest()
+        return max((e['version'] for e in manifest['versions']), default=0) + 1
+
+    def publish(self, model_data, metrics=None, dataset_fingerprint=None, version=None,
+                artifact_format='pickle'):
+        """
+        Write a new artifact and make it current.
+
+        Args:
+            model_data: Artifact dict as saved by retrain
+            metrics: Dict of evaluation metrics to record
+            dataset_fingerprint: Fingerprint of the training data
+            version: Version number (default: one past the highest)
+            artifact_format: 'pickle' or 'mmap' (see model_artifact)
+
+        Returns:
+            dict: the new manifest entry
+
+        Raises:
+            ValueError: if version is already published (published
+                artifacts are never overwritten)
+        """
+        manifest = self.load_manifest()
+        version = version or self.next_version()
+        if self.get_entry(version, manifest) is not None:
+            raise ValueError(f"Model version {version} is already in the registry")
+        suffix = '.pkl' if artifact_format == 'pickle' else '.mmap'
+        relative_path = os.path.join(MODELS_DIR, f'placement_model_v{version}{suffix}')
+
+        save_artifact(model_data, os.path.join(self.registry_dir, relative_path), artifact_format)
+
+        entry = {
+            'version': version,
+            'path': relative_path,
+            'model_name': model_data.get('model_name') if isinstance(model_data, dict) else None,
+            'artifact_format': artifact_format,
+            'metrics': metrics or {},
+            'dataset_fingerprint': dataset_fingerprint,
+            'published_at': datetime.now().isoformat(),
+        }
+        manifest['versions'].append(entry)
+        manifest['current'] = version
+        self.save_manifest(manifest)
+
+        # The pointer swap is what makes the new model live
+        _atomic_write_text(os.path.join(self.registry_dir, CURRENT_FILE), relative_path)
+
+        self.prune()
+        return entry
+
+    def set_current(self, version):
+        """Point CURRENT at an already published version (e.g. a rollback)."""
+        manifest = self.load_manifest()
+        entry = self.get_entry(version, manifest)
+        if entry is None:
+            raise ValueError(f"Model version {version} is not in the registry")
+        manifest['current'] = version
+        self.save_manifest(manifest)
+        _atomic_write_text(os.path.join(self.registry_dir, CURRENT_FILE), entry['path'])
+
+    def prune(self):
+        """
+        Delete all but the newest keep_versions artifacts. The current
+        version is always kept.
+
+        Returns:
+            list: versions removed
+        """
+        manifest = self.load_manifest()
+        by_age = sorted(manifest['versions'], key=lambda e: e['version'], reverse=True)
+        keep = {e['version'] for e in by_age[:self.keep_versions]}
+        keep.add(manifest['current'])
+
+        removed = [e for e in manifest['versions'] if e['version'] not in keep]
+        if not removed:
+            return []
+
+        manifest['versions'] = [e for e in manifest['versions'] if e['version'] in keep]
+        self.save_manifest(manifest)
+        for entry in removed:
+            remove_artifact(os.path.join(self.registry_dir, entry['path']))
+        return [e['version'] for e in removed]
@@ -0,0 +1,144 @@
+# backend/model_search.py
+
+"""
+Budgeted hyperparameter search for the retraining candidates.
+
+successive_halving evaluates every configuration of a parameter space on
+a small subsample of the training data, keeps the best 1/factor of them,
+and re-evaluates the survivors on factor times more data, until one
+configuration is left or the full training set has been used. Most
+configurations are only ever fit on a fraction of the data, so a space
+of dozens of configurations costs a few full fits.
+
+Configurations within a rung are fit in parallel threads (sklearn's
+solvers and tree builders release the GIL). No rung or configuration is
+started once the wall-clock deadline would be overrun; the best
+configuration scored so far is kept.
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, train_test_split
+
+# Searched around train_models' default configurations
+SEARCH_SPACES = {
+    'logistic': {
+        'C': [0.01, 0.1, 1.0, 10.0, 100.0],
+    },
+    'random_forest': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [5, 10, 20, None],
+        'min_samples_leaf': [1, 5, 20],
+    },
+    'gradient_boost': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [3, 5],
+        'learning_rate': [0.05, 0.1, 0.2],
+        'subsample': [0.8, 1.0],
+    },
+}
+
+# Held-out rows used to score configurations; larger sets barely change the ranking
+MAX_VALIDATION_ROWS = 50_000
+
+
+def _fit_and_score(estimator, params, X_fit, y_fit, X_val, y_val, deadline):
+    """Validation AUC of one configuration, or None if the deadline passed before it started."""
+    if deadline is not None and time.monotonic() >= deadline:
+        return None
+    model = clone(estimator).set_params(**params)
+    if model.get_params().get('n_jobs') is not None:
+        model.set_params(n_jobs=1)  # parallelism comes from fitting configurations side by side
+    model.fit(X_fit, y_fit)
+    return roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])
+
+
+def successive_halving(estimator, param_space, X, y, factor=3, min_samples=2000,
+                       max_configs=None, deadline=None, workers=1, random_state=42):
+    """
+    Pick hyperparameters for estimator by successive halving.
+
+    Args:
+        estimator: Unfitted estimator holding the base configuration
+        param_space: Dict of parameter name -> list of values to try
+        X: Training features (ndarray)
+        y: Training labels
+        factor: Keep 1/factor of the configurations per rung and grow the
+            sample by factor
+        min_samples: Training rows in the first rung
+        max_configs: Try at most this many configurations, sampled at random
+        deadline: time.monotonic() value after which no new fit is started
+            (None = no limit)
+        workers: Configurations fit in parallel
+        random_state: Seed for the sampling and the validation split
+
+    Returns:
+        tuple: (best_params, rungs) where best_params is {} if nothing was
+        scored in time, and rungs lists per-rung samples, seconds and the
+        (params, auc) scores of the configurations fit
+    """
+    rng = np.random.default_rng(random_state)
+    configs = list(ParameterGrid(param_space))
+    if max_configs and len(configs) > max_configs:
+        configs = [configs[i] for i in sorted(rng.choice(len(configs), max_configs, replace=False))]
+
+    # Scored on rows carved out of the training set, never the final test set
+    y = np.asarray(y)
+    val_size = min(0.2, MAX_VALIDATION_ROWS / len(y))
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X, y, test_size=val_size, random_state=random_state, stratify=y
+    )
+
+    n_rungs = max(1, math.ceil(math.log(len(configs), factor))) if len(configs) > 1 else 1
+    order = rng.permutation(len(y_fit))
+
+    rungs = []
+    best_params = {}
+    last_seconds = None
+    for rung in range(n_rungs):
+        n_samples = min(len(y_fit), max(min_samples, len(y_fit) // factor ** (n_rungs - 1 - rung)))
+        if rung == n_rungs - 1:
+            n_samples = len(y_fit)
+
+        # Projected from the previous rung: cost grows with rows x configurations
+        if deadline is not None and last_seconds is not None:
+            previous = rungs[-1]
+            projected = (last_seconds * n_samples / previous['samples']
+                         * len(configs) / len(previous['scores']))
+            if time.monotonic() + projected > deadline:
+                break
+
+        rows = np.sort(order[:n_samples])
+        X_rung, y_rung = X_fit[rows], y_fit[rows]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_fit_and_score, estimator, params, X_rung, y_rung,
+                                   X_val, y_val, deadline)
+                       for params in configs]
+            scored = [(params, future.result()) for params, future in zip(configs, futures)]
+        last_seconds = time.perf_counter() - start
+
+        # Configurations cut off by the deadline drop out; every one left was
+        # a survivor of the previous rung, scored on more data
+        scored = [(params, score) for params, score in scored if score is not None]
+        if not scored:
+            break
+        rungs.append({'samples': n_samples, 'seconds': last_seconds, 'scores': scored})
+
+        # Stable sort, so ties keep grid order
+        ranked = [params for params, _ in sorted(scored, key=lambda item: -item[1])]
+        best_params = ranked[0]
+        if n_samples == len(y_fit) or len(scored) < len(configs):
+            break
+        configs = ranked[:max(1, math.ceil(len(configs) / factor))]
+        if len(configs) == 1:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+    return best_params, rungs
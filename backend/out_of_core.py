@@ -0,0 +1,166 @@
+# backend/out_of_core.py
+
+"""
+Out-of-core training of the logistic candidate on memory-mapped columns.
+
+The cgpa, iq and placement arrays of each columnar part are memory-mapped
+and read one block of rows at a time, so the dataset never has to fit in
+RAM; only the block being processed is ever held in a DataFrame:
+
+    1. one streaming pass computes the StandardScaler statistics
+       (StandardScaler.partial_fit) over the training rows
+    2. a log-loss SGDClassifier is fit with partial_fit on shuffled
+       blocks, for a few epochs
+    3. a final pass scores the held-out rows; accuracy is exact and the
+       AUC comes from per-class score histograms
+
+The train/test split is made by row index: each block draws its test
+mask from a generator seeded by the block's position, so every pass sees
+the same split without storing it.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+try:
+    from backend.dataset_io import columnar_rows, read_columns
+except ImportError:  # run as a script from inside backend/
+    from dataset_io import columnar_rows, read_columns
+
+FEATURES = ('cgpa', 'iq')
+LABEL = 'placement'
+
+DEFAULT_BLOCK_ROWS = 262_144
+
+# Score histogram resolution for the streamed AUC (error well under 1e-3)
+AUC_BINS = 10_000
+
+
+class MappedDataset:
+    """
+    Memory-mapped feature and label columns across a dataset's columnar parts.
+
+    Args:
+        part_paths: Columnar directories in stored order (see
+            dataset_io.columnar_parts)
+        drop_positions: Row positions to leave out, e.g. superseded rows
+    """
+
+    def __init__(self, part_paths, drop_positions=None):
+        self.parts = [read_columns(p, list(FEATURES) + [LABEL], mmap=True) for p in part_paths]
+        self.offsets = np.cumsum([0] + [columnar_rows(p) for p in part_paths])
+        self.drop_positions = np.sort(np.asarray(
+            drop_positions if drop_positions is not None else [], dtype=np.int64
+        ))
+
+    def blocks(self, block_rows=DEFAULT_BLOCK_ROWS):
+        """(first row position, number of rows, part index, start in part) per block."""
+        for i, start in enumerate(self.offsets[:-1]):
+            part_rows = self.offsets[i + 1] - start
+            for offset in range(0, part_rows, block_rows):
+                yield int(start + offset), int(min(block_rows, part_rows - offset)), i, offset
+
+    def read(self, block, rows=None):
+        """
+        Features (float64 DataFrame with the FEATURES columns) and labels
+        of a block, optionally only some of its rows.
+
+        Args:
+            block: Entry from blocks()
+            rows: Row offsets within the block (default: all)
+        """
+        _, n_rows, part, start = block
+        columns = self.parts[part]
+        if rows is None:
+            rows = slice(start, start + n_rows)
+        else:
+            rows = rows + start
+        # Named columns, so the scaler records the feature names predictions pass
+        X = pd.DataFrame({col: np.asarray(columns[col][rows], dtype=np.float64) for col in FEATURES})
+        return X, np.asarray(columns[LABEL][rows])
+
+    def split(self, block, test_size, random_state):
+        """Row offsets of a block's (train, test) rows; the same on every call."""
+        position, n_rows, _, _ = block
+        is_test = np.random.default_rng([random_state, position]).random(n_rows) < test_size
+        keep = np.ones(n_rows, dtype=bool)
+        lo, hi = np.searchsorted(self.drop_positions, [position, position + n_rows])
+        keep[self.drop_positions[lo:hi] - position] = False
+        return np.flatnonzero(keep & ~is_test), np.flatnonzero(keep & is_test)
+
+
+def _histogram_auc(positive, negative):
+    """ROC AUC from per-bin score counts of the positive and negative class."""
+    n_pos, n_neg = positive.sum(), negative.sum()
+    if n_pos == 0 or n_neg == 0:
+        return None
+    negatives_below = np.cumsum(negative) - negative
+    # Ties within a bin count half, as in the trapezoidal ROC
+    return float((positive * (negatives_below + 0.5 * negative)).sum() / (n_pos * n_neg))
+
+
+def fit_out_of_core_logistic(dataset, test_size=0.2, epochs=3, block_rows=DEFAULT_BLOCK_ROWS,
+                             random_state=42):
+    """
+    Fit a StandardScaler and a log-loss SGDClassifier block by block.
+
+    Args:
+        dataset: MappedDataset to train on
+        test_size: Fraction of rows held out for evaluation
+        epochs: Passes of SGD over the training rows
+        block_rows: Rows read per block (bounds memory use)
+        random_state: Seed for the split, the shuffling and SGD
+
+    Returns:
+        dict: model, scaler, holdout accuracy/auc, train_rows and test_rows
+    """
+    blocks = list(dataset.blocks(block_rows))
+
+    # Pass 1: scaler statistics over the training rows. The split is
+    # recomputed per block on every pass rather than kept for the dataset
+    scaler = StandardScaler()
+    train_rows_total = 0
+    for block in blocks:
+        train_rows, _ = dataset.split(block, test_size, random_state)
+        train_rows_total += len(train_rows)
+        if len(train_rows):
+            scaler.partial_fit(dataset.read(block, train_rows)[0])
+
+    # SGD epochs over shuffled blocks, rows shuffled within each block
+    rng = np.random.default_rng(random_state)
+    model = SGDClassifier(loss='log_loss', random_state=random_state)
+    classes = np.array([0, 1])
+    for _ in range(epochs):
+        for i in rng.permutation(len(blocks)):
+            train_rows, _ = dataset.split(blocks[i], test_size, random_state)
+            if len(train_rows):
+                X, y = dataset.read(blocks[i], rng.permutation(train_rows))
+                model.partial_fit(scaler.transform(X), y, classes=classes)
+
+    # Holdout pass: exact accuracy, AUC from score histograms
+    correct = 0
+    test_rows_total = 0
+    positive = np.zeros(AUC_BINS, dtype=np.int64)
+    negative = np.zeros(AUC_BINS, dtype=np.int64)
+    for block in blocks:
+        _, test_rows = dataset.split(block, test_size, random_state)
+        if not len(test_rows):
+            continue
+        X, y = dataset.read(block, test_rows)
+        proba = model.predict_proba(scaler.transform(X))[:, 1]
+        correct += int(((proba > 0.5).astype(y.dtype) == y).sum())
+        test_rows_total += len(y)
+        bins = np.minimum((proba * AUC_BINS).astype(np.int64), AUC_BINS - 1)
+        positive += np.bincount(bins[y == 1], minlength=AUC_BINS)
+        negative += np.bincount(bins[y != 1], minlength=AUC_BINS)
+
+    return {
+        'model': model,
+        'scaler': scaler,
+        'accuracy': correct / test_rows_total if test_rows_total else None,
+        'auc': _histogram_auc(positive, negative),
+        'train_rows': train_rows_total,
+        'test_rows': test_rows_total
+    }
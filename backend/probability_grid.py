@@ -0,0 +1,98 @@
+# backend/probability_grid.py
+
+"""
+Precomputed placement-probability lookup grid.
+
+The input domain is small and discrete: CGPA 0-10 in 0.1 steps and IQ
+70-160 in 0.1 steps (as produced by calculate_iq). The grid stores the
+model's placement probability at every (cgpa, iq) point, so in-domain
+queries become an array index plus bilinear interpolation instead of a
+model call. The grid is built at save time and stored in the model .pkl
+dict under 'probability_grid'.
+"""
+
+import numpy as np
+import pandas as pd
+
+GRID_DOMAIN = {
+    'cgpa_min': 0.0, 'cgpa_max': 10.0, 'cgpa_step': 0.1,
+    'iq_min': 70.0, 'iq_max': 160.0, 'iq_step': 0.1,
+}
+
+
+def _axis(start, stop, step):
+    n = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(n), 10)
+
+
+def build_probability_grid(model, scaler=None, domain=None):
+    """
+    Evaluate the model over the whole input domain.
+
+    Args:
+        model: Fitted classifier with predict_proba and classes 0/1
+        scaler: Fitted scaler applied before the model, if any
+        domain: Grid bounds and steps (default: GRID_DOMAIN)
+
+    Returns:
+        dict: the domain keys plus 'probabilities', a float64 array of
+        shape (n_cgpa, n_iq)
+    """
+    domain = dict(domain or GRID_DOMAIN)
+    cgpa_axis = _axis(domain['cgpa_min'], domain['cgpa_max'], domain['cgpa_step'])
+    iq_axis = _axis(domain['iq_min'], domain['iq_max'], domain['iq_step'])
+
+    cgpa_mesh, iq_mesh = np.meshgrid(cgpa_axis, iq_axis, indexing='ij')
+    features = pd.DataFrame({'cgpa': cgpa_mesh.ravel(), 'iq': iq_mesh.ravel()})
+    if scaler is not None:
+        features = scaler.transform(features)
+
+    proba = model.predict_proba(features)[:, list(model.classes_).index(1)]
+    domain['probabilities'] = proba.reshape(len(cgpa_axis), len(iq_axis)).astype(np.float64)
+    return domain
+
+
+def grid_contains(grid, cgpa, iq):
+    """True (elementwise for arrays) where (cgpa, iq) lies inside the grid."""
+    return ((cgpa >= grid['cgpa_min']) & (cgpa <= grid['cgpa_max'])
+            & (iq >= grid['iq_min']) & (iq <= grid['iq_max']))
+
+
+def _cell(value, start, step, n):
+    """Lower cell index and interpolation weight along one axis."""
+    position = (value - start) / step
+    index = int(position)
+    if index >= n - 1:
+        return n - 2, 1.0
+    return index, position - index
+
+
+def grid_probability(grid, cgpa, iq):
+    """
+    Placement probability for one in-domain (cgpa, iq), by bilinear
+    interpolation. Exact at grid points. Callers check grid_contains first.
+    """
+    table = grid['probabilities']
+    i, u = _cell(cgpa, grid['cgpa_min'], grid['cgpa_step'], table.shape[0])
+    j, v = _cell(iq, grid['iq_min'], grid['iq_step'], table.shape[1])
+    row0, row1 = table[i], table[i + 1]
+    return float(
+        (1 - u) * ((1 - v) * row0[j] + v * row0[j + 1])
+        + u * ((1 - v) * row1[j] + v * row1[j + 1])
+    )
+
+
+def grid_probabilities(grid, cgpa, iq):
+    """Vectorised grid_probability for in-domain float arrays."""
+    table = grid['probabilities']
+    n_cgpa, n_iq = table.shape
+
+    pos_c = (cgpa - grid['cgpa_min']) / grid['cgpa_step']
+    pos_i = (iq - grid['iq_min']) / grid['iq_step']
+    i = np.clip(pos_c.astype(np.int64), 0, n_cgpa - 2)
+    j = np.clip(pos_i.astype(np.int64), 0, n_iq - 2)
+    u = np.clip(pos_c - i, 0.0, 1.0)
+    v = np.clip(pos_i - j, 0.0, 1.0)
+
+    return ((1 - u) * ((1 - v) * table[i, j] + v * table[i, j + 1])
+            + u * ((1 - v) * table[i + 1, j] + v * table[i + 1, j + 1]))
@@ -0,0 +1,175 @@
+# backend/retrain_scheduler.py
+
+"""
+Background retrain scheduler.
+
+A long-running process that watches the base dataset and retrains the
+model when either threshold in training_config.json is reached:
+
+    retrain_interval_days       the deployed model is this many days old
+    retrain_min_new_samples     this many new samples have arrived since
+                                the last scheduled retrain
+
+The dataset is checked every scheduler_poll_seconds; new samples are only
+counted when the dataset's files have changed. The process lowers its own
+CPU priority by scheduler_nice at start-up, so training never competes
+with serving processes, and each retrain runs under the retrainer's
+cross-process lock, so retrains never overlap: a cycle that finds the
+lock held (a manual or another scheduler's retrain) is skipped.
+
+Run it with:
+
+    python -m backend.retrain_scheduler --base backend/placement-dataset.csv \\
+        --model backend/placement_model_advanced.pkl
+"""
+
+import argparse
+import os
+import signal
+import threading
+from datetime import datetime
+
+try:
+    from backend.auto_retrain import AutoRetrainer
+    from backend.dataset_io import dataset_stamp
+    from backend.file_lock import LockTimeout
+except ImportError:  # run as a script from inside backend/
+    from auto_retrain import AutoRetrainer
+    from dataset_io import dataset_stamp
+    from file_lock import LockTimeout
+
+
+def lower_priority(increment):
+    """Raise this process's niceness by increment (no-op where unsupported)."""
+    if increment and hasattr(os, 'nice'):
+        try:
+            os.nice(increment)
+        except OSError:
+            pass
+
+
+class RetrainScheduler:
+    """
+    Triggers AutoRetrainer.retrain on time or data-volume thresholds.
+
+    Args:
+        retrainer: AutoRetrainer for the dataset and model to maintain
+    """
+
+    def __init__(self, retrainer):
+        self.retrainer = retrainer
+        self._stop = threading.Event()
+        self._last_stamp = None
+        self._live_rows = None
+
+    def new_samples(self):
+        """Live rows added since the last scheduled retrain; counted only when the dataset changed."""
+        stamp = dataset_stamp(self.retrainer.base_dataset_path)
+        if stamp != self._last_stamp or self._live_rows is None:
+            self._live_rows = self.retrainer.live_rows()
+            self._last_stamp = stamp
+        baseline = self.retrainer.config['rows_at_last_train']
+        if baseline is None:
+            # First run: start counting from here
+            self.retrainer.config['rows_at_last_train'] = self._live_rows
+            self.retrainer.save_config()
+            return 0
+        return max(0, self._live_rows - baseline)
+
+    def _attempted_recently(self):
+        """
+        True if a scheduled retrain ran within retrain_interval_days; a
+        failed one leaves last_train_date unchanged, and would otherwise be
+        retried on every poll.
+        """
+        attempt = self.retrainer.config.get('last_retrain_attempt')
+        if attempt is None:
+            return False
+        days = (datetime.now() - datetime.fromisoformat(attempt)).days
+        return days < self.retrainer.config['retrain_interval_days']
+
+    def check(self):
+        """
+        Whether a retrain is due.
+
+        Returns:
+            dict: due, reason ('time', 'volume' or None) and new_samples
+        """
+        # Other processes (manual retrains, ingestion) update the config
+        self.retrainer.config = self.retrainer.load_config()
+        new_samples = self.new_samples()
+        if self.retrainer.schedule_retrain_check() and not self._attempted_recently():
+            reason = 'time'
+        elif new_samples >= self.retrainer.config['retrain_min_new_samples']:
+            reason = 'volume'
+        else:
+            reason = None
+        return {'due': reason is not None, 'reason': reason, 'new_samples': new_samples}
+
+    def run_once(self):
+        """
+        Check the thresholds and retrain if one is reached.
+
+        Returns:
+            dict: the check, plus the retrain result or skip reason if one ran
+        """
+        decision = self.check()
+        if not decision['due']:
+            return decision
+
+        try:
+            with self.retrainer.retrain_lock(timeout=0):
+                print(f"[{datetime.now().isoformat(timespec='seconds')}] Retrain due "
+                      f"({decision['reason']}, {decision['new_samples']} new samples)")
+                rows = self._live_rows
+                result = self.retrainer.retrain(force=True)
+                # Counted from here on, whatever the outcome, so a failing
+                # dataset is retried on the next threshold rather than every poll
+                self.retrainer.config = self.retrainer.load_config()
+                self.retrainer.config['rows_at_last_train'] = rows
+                self.retrainer.config['last_retrain_attempt'] = datetime.now().isoformat()
+                self.retrainer.save_config()
+        except LockTimeout:
+            decision['result'] = {'status': 'skipped', 'reason': 'retrain_in_progress'}
+            return decision
+
+        decision['result'] = result
+        return decision
+
+    def run_forever(self):
+        """Poll until stop() is called or the process receives SIGTERM/SIGINT."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                # Keep the daemon alive; the next poll tries again
+                print(f"[{datetime.now().isoformat(timespec='seconds')}] Scheduler error: {e}")
+            self._stop.wait(self.retrainer.config['scheduler_poll_seconds'])
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Background retrain scheduler")
+    parser.add_argument('--base', required=True, help="Base dataset path")
+    parser.add_argument('--model', required=True, help="Model save path")
+    parser.add_argument('--config', default='training_config.json')
+    parser.add_argument('--once', action='store_true', help="Check once, retrain if due, and exit")
+    args = parser.parse_args()
+
+    retrainer = AutoRetrainer(args.base, args.model, args.config)
+    lower_priority(retrainer.config['scheduler_nice'])
+    scheduler = RetrainScheduler(retrainer)
+
+    if args.once:
+        print(scheduler.run_once())
+        return
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda signum, frame: scheduler.stop())
+    scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# backend/sampling.py
+
+"""
+Bounded-memory training samples from datasets larger than RAM.
+
+stratified_reservoir_sample makes one pass over a stream of DataFrame
+chunks and keeps, per class, the rows with the smallest random keys: a
+uniform random sample of each class maintained in a single pass
+(reservoir sampling), vectorised chunk by chunk. Rows are buffered and
+the reservoir trimmed back whenever it doubles, and once full only rows
+whose key beats the current cut-off are kept, so memory stays bounded by
+twice the reservoirs plus one chunk, whatever the dataset size.
+
+With a recency half-life, keys follow weighted reservoir sampling
+(Efraimidis-Spirakis) with weights doubling every half_life rows, so
+recent records are proportionally more likely to be kept. Keys are
+compared in log space, so the exponential weights never overflow.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _sample_keys(rng, positions, half_life):
+    """Log-space reservoir keys; the smallest keys form the sample."""
+    keys = np.log(rng.standard_exponential(len(positions)))
+    if half_life:
+        # log(E / w) with w = 2 ** (position / half_life)
+        keys -= positions * (np.log(2.0) / half_life)
+    return keys
+
+
+class _Reservoir:
+    """The size rows with the smallest keys seen so far, for one class."""
+
+    def __init__(self, size):
+        self.size = size
+        self.parts = []  # (keys, positions, rows) buffered since the last trim
+        self.buffered = 0
+        self.cutoff = np.inf  # largest kept key once the reservoir is full
+
+    def add(self, keys, positions, rows):
+        below = keys < self.cutoff
+        if not below.all():
+            keys, positions, rows = keys[below], positions[below], rows[below]
+        if len(keys):
+            self.parts.append((keys, positions, rows.reset_index(drop=True)))
+            self.buffered += len(keys)
+            if self.buffered >= 2 * self.size:
+                self.trim(self.size)
+
+    def trim(self, size):
+        """Merge the buffer and keep the size smallest keys; returns (keys, positions, rows)."""
+        if not self.parts:
+            return np.empty(0), np.empty(0, dtype=np.int64), None
+        keys = np.concatenate([part[0] for part in self.parts])
+        positions = np.concatenate([part[1] for part in self.parts])
+        rows = pd.concat([part[2] for part in self.parts], ignore_index=True)
+        if len(keys) > size:
+            kept = np.argpartition(keys, size)[:size] if size else np.empty(0, dtype=np.int64)
+            keys, positions, rows = keys[kept], positions[kept], rows.iloc[kept].reset_index(drop=True)
+            self.cutoff = keys.max() if size else -np.inf
+        self.parts = [(keys, positions, rows)]
+        self.buffered = len(keys)
+        return keys, positions, rows
+
+
+def stratified_reservoir_sample(chunks, size, label='placement', half_life=None,
+                                drop_positions=None, random_state=42):
+    """
+    Class-stratified random sample of size rows from a stream of chunks.
+
+    Each class keeps a reservoir of up to size rows during the pass; at
+    the end each class is cut down to its share of size, so the sample
+    has the dataset's class proportions.
+
+    Args:
+        chunks: Iterable of DataFrames, e.g. dataset_io.iter_dataset_chunks,
+            in stored (oldest first) order
+        size: Rows in the sample
+        label: Class column
+        half_life: Optional recency weighting: a record half_life rows
+            newer is twice as likely to be sampled (None = uniform)
+        drop_positions: Row positions in the stream to skip, e.g. rows
+            superseded by later records
+        random_state: Seed
+
+    Returns:
+        tuple: (sample DataFrame in stored order, class counts of the
+        rows seen)
+    """
+    rng = np.random.default_rng(random_state)
+    drop_positions = np.sort(np.asarray(drop_positions if drop_positions is not None else [],
+                                        dtype=np.int64))
+
+    reservoirs = {}
+    counts = {}
+    offset = 0
+    for chunk in chunks:
+        positions = np.arange(offset, offset + len(chunk))
+        lo, hi = np.searchsorted(drop_positions, [offset, offset + len(chunk)])
+        offset += len(chunk)
+        if hi > lo:
+            keep = np.ones(len(chunk), dtype=bool)
+            keep[drop_positions[lo:hi] - positions[0]] = False
+            chunk, positions = chunk[keep], positions[keep]
+        if len(chunk) == 0:
+            continue
+
+        keys = _sample_keys(rng, positions, half_life)
+        labels = chunk[label].to_numpy()
+        for cls in np.unique(labels).tolist():
+            in_class = labels == cls
+            counts[cls] = counts.get(cls, 0) + int(in_class.sum())
+            if cls not in reservoirs:
+                reservoirs[cls] = _Reservoir(size)
+            reservoirs[cls].add(keys[in_class], positions[in_class], chunk[in_class])
+
+    if not reservoirs:
+        return pd.DataFrame(), counts
+
+    # Each class's share of the sample, by largest remainder so the shares sum to size
+    total = sum(counts.values())
+    size = min(size, total)
+    classes = sorted(reservoirs)
+    exact = np.array([size * counts[cls] / total for cls in classes])
+    shares = np.floor(exact).astype(int)
+    for i in np.argsort(-(exact - shares), kind='stable')[:size - shares.sum()]:
+        shares[i] += 1
+
+    parts, part_positions = [], []
+    for cls, share in zip(classes, shares):
+        _, positions, rows = reservoirs[cls].trim(share)
+        parts.append(rows)
+        part_positions.append(positions)
+
+    sample = pd.concat(parts, ignore_index=True)
+    order = np.argsort(np.concatenate(part_positions), kind='stable')
+    return sample.iloc[order].reset_index(drop=True), counts
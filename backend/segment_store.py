@@ -0,0 +1,312 @@
+# backend/segment_store.py
+
+"""
+Segmented dataset store for continuously ingested placement data.
+
+Layout of a store directory:
+
+    manifest.json           columns, next segment number, the live
+                            segments in order and retired segments
+    segments/seg-<N>-<ts>   immutable columnar segments (see dataset_io)
+    LOCK                    writer lock file
+
+Ingestion writes each batch as a new segment and then atomically
+replaces the manifest, so nothing is ever rewritten in place. Readers
+read the manifest once and get a consistent snapshot: the segments it
+lists never change, and segments dropped by compaction are only deleted
+after a grace period. Compaction merges runs of small segments into one,
+dropping duplicate and superseded rows.
+
+dataset_io reads a store as one logical dataset (read_dataset,
+iter_dataset_chunks) and appends to it with append_dataset.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    from backend.dataset_io import (
+        SEGMENT_MANIFEST_FILE, SEGMENTS_DIR, columnar_rows, is_segmented, read_dataset,
+        read_segment_manifest, segment_paths, write_columns
+    )
+    from backend.file_lock import FileLock
+except ImportError:  # run as a script from inside backend/
+    from dataset_io import (
+        SEGMENT_MANIFEST_FILE, SEGMENTS_DIR, columnar_rows, is_segmented, read_dataset,
+        read_segment_manifest, segment_paths, write_columns
+    )
+    from file_lock import FileLock
+
+LOCK_FILE = 'LOCK'
+
+# Retired segments are kept this long for readers still using an old snapshot
+RETIRE_GRACE_SECONDS = 600
+
+DEFAULT_SMALL_SEGMENT_ROWS = 100_000
+DEFAULT_MIN_SEGMENTS_TO_COMPACT = 8
+
+
+class PositionMap:
+    """
+    Old -> new row positions after compaction merged runs of a snapshot.
+
+    Rows before a run keep their position, rows kept in a run move to
+    their place in the merged segment, and everything after a run
+    (including segments appended since the snapshot) shifts down by the
+    rows the run dropped. Dropped rows map to -1.
+
+    Args:
+        runs: (first position, stop position, kept positions sorted) per
+            merged run, in order
+        old_rows: Rows in the store before the merged runs were spliced in
+    """
+
+    def __init__(self, runs, old_rows):
+        self.runs = runs
+        self.old_rows = int(old_rows)
+        self.new_rows = self.old_rows - sum(stop - start - len(kept) for start, stop, kept in runs)
+
+    def __call__(self, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        new = positions.copy()
+        removed = 0  # rows dropped by earlier runs
+        for start, stop, kept in self.runs:
+            in_run = (positions >= start) & (positions < stop)
+            at = np.searchsorted(kept, positions[in_run])
+            found = at < len(kept)
+            found[found] = kept[at[found]] == positions[in_run][found]
+            new[in_run] = np.where(found, start - removed + at, -1)
+            new[positions >= stop] -= (stop - start) - len(kept)
+            removed += (stop - start) - len(kept)
+        return new
+
+
+class SegmentStore:
+    """
+    Append-only store of immutable, time-ordered dataset segments.
+    """
+
+    def __init__(self, path):
+        if not is_segmented(path):
+            raise FileNotFoundError(f"Segmented store not found: {path}")
+        self.path = path
+
+    @classmethod
+    def create(cls, path, columns=None):
+        """Create an empty store."""
+        os.makedirs(os.path.join(path, SEGMENTS_DIR), exist_ok=True)
+        if not is_segmented(path):
+            _write_manifest(path, {'columns': list(columns or []), 'next_segment': 0,
+                                   'segments': [], 'retired': []})
+        return cls(path)
+
+    def lock(self, timeout=None):
+        """Writer lock; held while the manifest is read, changed and replaced."""
+        return FileLock(os.path.join(self.path, LOCK_FILE), timeout)
+
+    def manifest(self):
+        return read_segment_manifest(self.path)
+
+    def read(self, manifest=None, columns=None):
+        """
+        The rows of one snapshot as a DataFrame.
+
+        Args:
+            manifest: Snapshot to read (default: the current manifest)
+            columns: Columns to load (default: all)
+        """
+        manifest = manifest or self.manifest()
+        parts = [read_dataset(p, columns) for p in segment_paths(self.path, manifest)]
+        if not parts:
+            return pd.DataFrame(columns=columns or manifest['columns'])
+        return pd.concat(parts, ignore_index=True)
+
+    def _write_segment_as(self, df, name, columns):
+        """Write df as the immutable segment name and return its manifest entry."""
+        final_path = os.path.join(self.path, SEGMENTS_DIR, name)
+        tmp_path = final_path + '.tmp'
+        write_columns(tmp_path, df[columns])
+        os.replace(tmp_path, final_path)
+        return {'name': name, 'rows': len(df), 'created_at': datetime.now().isoformat()}
+
+    def _write_segment(self, df, manifest):
+        """Write df as the next numbered segment and return its manifest entry."""
+        if not manifest['columns']:
+            manifest['columns'] = list(df.columns)
+        name = f"seg-{manifest['next_segment']:08d}-{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+        manifest['next_segment'] += 1
+        return self._write_segment_as(df, name, manifest['columns'])
+
+    def append(self, df):
+        """
+        Add df as a new segment after all existing ones.
+
+        Returns:
+            dict: the new segment's manifest entry, or None if df is empty
+        """
+        if len(df) == 0:
+            return None
+        with self.lock():
+            manifest = self.manifest()
+            if manifest['columns']:
+                missing = set(manifest['columns']) - set(df.columns)
+                if missing:
+                    raise ValueError(f"Rows to append are missing columns: {sorted(missing)}")
+            entry = self._write_segment(df, manifest)
+            manifest['segments'].append(entry)
+            _write_manifest(self.path, manifest)
+        return entry
+
+    def replace(self, df):
+        """Replace the store's contents with df as a single segment."""
+        with self.lock():
+            manifest = self.manifest()
+            manifest['columns'] = list(df.columns)
+            entry = self._write_segment(df, manifest)
+            self._retire(manifest, manifest['segments'])
+            manifest['segments'] = [entry]
+            _write_manifest(self.path, manifest)
+
+    def _retire(self, manifest, entries):
+        now = time.time()
+        manifest['retired'].extend({'name': e['name'], 'retired_at': now} for e in entries)
+
+    def compaction_runs(self, manifest=None, small_segment_rows=DEFAULT_SMALL_SEGMENT_ROWS):
+        """Runs (start, stop) of two or more consecutive segments under small_segment_rows."""
+        segments = (manifest or self.manifest())['segments']
+        runs, start = [], None
+        for i, seg in enumerate(segments + [None]):
+            small = seg is not None and seg['rows'] < small_segment_rows
+            if small and start is None:
+                start = i
+            elif not small and start is not None:
+                if i - start >= 2:
+                    runs.append((start, i))
+                start = None
+        return runs
+
+    def compact(self, manifest=None, drop_positions=None, dedupe_keys=('cgpa', 'iq'),
+                small_segment_rows=DEFAULT_SMALL_SEGMENT_ROWS,
+                min_segments=DEFAULT_MIN_SEGMENTS_TO_COMPACT, on_commit=None):
+        """
+        Merge runs of small segments into single segments.
+
+        Merging reads an existing snapshot and writes new segments without
+        holding the writer lock, so ingestion continues meanwhile; the lock
+        is only taken to splice the merged segments into the manifest.
+
+        Args:
+            manifest: Snapshot to compact (default: the current manifest)
+            drop_positions: Row positions in that snapshot to leave out,
+                e.g. rows superseded by later records
+            dedupe_keys: Within a merged run, keep only the last row per key
+                (None keeps every row)
+            small_segment_rows: Segments with fewer rows are merged
+            min_segments: Do nothing unless at least this many small
+                segments are waiting to be merged
+            on_commit: Called with a PositionMap under the writer lock once
+                the new manifest is in place, to move state derived from
+                row positions (e.g. the dedupe index) to the new layout
+
+        Returns:
+            int: segments merged away (0 if nothing was compacted)
+        """
+        manifest = manifest or self.manifest()
+        runs = self.compaction_runs(manifest, small_segment_rows)
+        if sum(stop - start for start, stop in runs) < min_segments:
+            return 0
+
+        offsets = np.cumsum([0] + [seg['rows'] for seg in manifest['segments']])
+        drop_positions = np.asarray(drop_positions if drop_positions is not None else [], dtype=np.int64)
+        paths = segment_paths(self.path, manifest)
+
+        # Merged segments keep the number of the first segment they replace,
+        # so segment names stay in time order
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        merged = []
+        for start, stop in runs:
+            df = pd.concat([read_dataset(p, mmap=False) for p in paths[start:stop]], ignore_index=True)
+            in_run = drop_positions[(drop_positions >= offsets[start]) & (drop_positions < offsets[stop])]
+            if len(in_run):
+                df = df.drop(index=in_run - offsets[start])
+            if dedupe_keys:
+                df = df.drop_duplicates(subset=list(dedupe_keys), keep='last')
+            kept = offsets[start] + df.index.to_numpy(dtype=np.int64)
+            df = df.reset_index(drop=True)
+            first_number = manifest['segments'][start]['name'].split('-')[1]
+            entry = self._write_segment_as(df, f"seg-{first_number}-c{stamp}", manifest['columns'])
+            merged.append((start, stop, entry, kept))
+
+        with self.lock():
+            current = self.manifest()
+            names = [seg['name'] for seg in current['segments']]
+            snapshot_names = [seg['name'] for seg in manifest['segments']]
+            if names[:len(snapshot_names)] != snapshot_names:
+                # Another compaction changed the store meanwhile; try again later
+                for _, _, entry, _ in merged:
+                    shutil.rmtree(os.path.join(self.path, SEGMENTS_DIR, entry['name']), ignore_errors=True)
+                return 0
+
+            # Segments appended since the snapshot stay after the merged ones
+            position_map = PositionMap(
+                [(offsets[start], offsets[stop], kept) for start, stop, _, kept in merged],
+                self.rows(current)
+            )
+            segments = list(current['segments'])
+            removed = 0
+            for start, stop, entry, _ in reversed(merged):
+                self._retire(current, segments[start:stop])
+                segments[start:stop] = [entry]
+                removed += stop - start - 1
+            current['segments'] = segments
+            self._collect_garbage(current)
+            _write_manifest(self.path, current)
+            if on_commit is not None:
+                on_commit(position_map)
+        return removed
+
+    def _collect_garbage(self, manifest, grace_seconds=RETIRE_GRACE_SECONDS):
+        """Delete retired segments older than the grace period."""
+        now = time.time()
+        kept = []
+        for entry in manifest['retired']:
+            if now - entry['retired_at'] >= grace_seconds:
+                shutil.rmtree(os.path.join(self.path, SEGMENTS_DIR, entry['name']), ignore_errors=True)
+            else:
+                kept.append(entry)
+        manifest['retired'] = kept
+
+    def rows(self, manifest=None):
+        """Total rows in a snapshot."""
+        return sum(seg['rows'] for seg in (manifest or self.manifest())['segments'])
+
+    def verify(self):
+        """Check every live segment exists with the row count the manifest records."""
+        manifest = self.manifest()
+        for seg, path in zip(manifest['segments'], segment_paths(self.path, manifest)):
+            if columnar_rows(path) != seg['rows']:
+                raise ValueError(f"Segment {seg['name']} has {columnar_rows(path)} rows, "
+                                 f"manifest says {seg['rows']}")
+        return True
+
+
+def _write_manifest(path, manifest):
+    """Replace the manifest atomically (temp file + os.replace)."""
+    fd, tmp_path = tempfile.mkstemp(dir=path, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(path, SEGMENT_MANIFEST_FILE))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -1,27 +1,378 @@
 # backend/tools.py
 
 import pandas as pd
-import joblib
+import numpy as np
+import functools
+import math
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.dataset_io import (
+    columnar_rows, dataset_format, is_columnar, iter_dataset_chunks, list_shard_paths,
+    open_dataset_writer, read_columnar_slice, read_dataset, write_dataset
+)
+from backend.probability_grid import grid_contains, grid_probabilities, grid_probability
+from backend.model_registry import resolve_current
+from backend.model_artifact import artifact_stamp_path, is_mmap_artifact, load_artifact, save_artifact
+from backend import metrics
+from backend.metrics import BULK_ROWS, PREDICT_SECONDS, timed
+
+# -----------------------------
+# Fused linear evaluator
+# -----------------------------
+class LinearEvaluator:
+    """
+    A StandardScaler and binary LogisticRegression folded into plain floats.
+
+    The scaled decision function w . ((x - mean) / scale) + b is rewritten
+    as a . x + c, so a single prediction is two multiplies, a sigmoid and
+    no sklearn validation. batch() applies the same weights to arrays.
+    """
+
+    def __init__(self, w_cgpa, w_iq, intercept):
+        self.w_cgpa = w_cgpa
+        self.w_iq = w_iq
+        self.intercept = intercept
+
+    def __call__(self, cgpa, iq):
+        z = self.w_cgpa * cgpa + self.w_iq * iq + self.intercept
+        # Numerically stable sigmoid
+        if z >= 0:
+            probability = 1.0 / (1.0 + math.exp(-z))
+        else:
+            e = math.exp(z)
+            probability = e / (1.0 + e)
+        return int(z > 0), probability
+
+    def batch(self, cgpa, iq):
+        z = self.w_cgpa * cgpa + self.w_iq * iq + self.intercept
+        probabilities = np.exp(-np.logaddexp(0.0, -z))
+        return (z > 0).astype(np.int64), probabilities
+
+
+def compile_linear_evaluator(model, scaler=None):
+    """
+    Build a LinearEvaluator for a model/scaler pair.
+
+    Returns:
+        LinearEvaluator, or None when the model/scaler pair is not one it
+        can reproduce exactly
+    """
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    # SGDClassifier with log loss (the incremental retrain model) is the
+    # same logistic function
+    is_logistic = type(model) is LogisticRegression or (
+        type(model) is SGDClassifier and model.loss == 'log_loss'
+    )
+    if not is_logistic or list(model.classes_) != [0, 1]:
+        return None
+    if model.coef_.shape != (1, 2):
+        return None
+    if scaler is not None and type(scaler) is not StandardScaler:
+        return None
+
+    weights = model.coef_[0].astype(np.float64)
+    intercept = float(model.intercept_[0])
+    if scaler is not None:
+        # mean_ is fitted even with with_mean=False, but transform ignores it
+        mean = scaler.mean_ if scaler.with_mean and scaler.mean_ is not None else np.zeros(2)
+        scale = scaler.scale_ if scaler.with_std and scaler.scale_ is not None else np.ones(2)
+        weights = weights / scale
+        intercept -= float(np.dot(weights, mean))
+
+    return LinearEvaluator(float(weights[0]), float(weights[1]), intercept)
+
+
+# -----------------------------
+# LRU memoization
+# -----------------------------
+DEFAULT_CACHE_SIZE = 4096
+
+# Inputs are rounded to this many decimals for cache keys, so float noise
+# such as 7.1 + 0.5 == 7.6000000000000005 still hits the same entry
+CACHE_DECIMALS = 6
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with hit/miss counters."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (found, value) and marks the entry as recently used."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drops all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def resize(self, maxsize):
+        """Changes the maximum size, evicting least recently used entries."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def info(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+
+prediction_cache = LRUCache()
+
+
+def set_cache_size(maxsize):
+    """Sets the prediction cache size; 0 disables memoization."""
+    prediction_cache.resize(maxsize)
+
+
+def cache_info():
+    """Hit/miss counters and size of the prediction cache."""
+    return prediction_cache.info()
+
+
+def _quantize(value):
+    return round(float(value), CACHE_DECIMALS)
+
+
+def _memoized(func):
+    """
+    Memoizes func on its quantized numeric arguments, their types and the
+    active model version; func itself is called with the arguments as
+    given. Callers get copies of dict results so cached values stay intact.
+    """
+    @functools.wraps(func)
+    def wrapper(*args):
+        if prediction_cache.maxsize <= 0:
+            return func(*args)
+        # Types are part of the key: 105 and 105.0 render differently in advice text
+        q_args = tuple((type(a).__name__, _quantize(a)) for a in args)
+        key = (func.__name__, get_active_model().version, q_args)
+        found, value = prediction_cache.get(key)
+        if not found:
+            value = func(*args)
+            prediction_cache.put(key, value)
+        return dict(value) if isinstance(value, dict) else value
+
+    return wrapper
+
 
 # -----------------------------
 # Load trained model + scaler
 # -----------------------------
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "placement_model.pkl")
-loaded_obj = joblib.load(MODEL_PATH)
 
-# If pickle contains dict (model + scaler), unpack it
-if isinstance(loaded_obj, dict):
-    model = loaded_obj.get("model")
-    scaler = loaded_obj.get("scaler", None)
-else:
-    model = loaded_obj
-    scaler = None
+# When this registry has a published model, its CURRENT artifact is served
+# instead of MODEL_PATH
+MODEL_REGISTRY_DIR = os.path.join(os.path.dirname(__file__), "model_registry")
+
+# How often (seconds) the watcher checks the artifact for a newer model
+RELOAD_INTERVAL = 5.0
+
+
+class ActiveModel:
+    """
+    Everything a prediction needs from one model artifact.
+
+    Instances are never modified after construction. Predictions take one
+    reference to the active instance and use it throughout, so a reload
+    swapping in a new instance can never pair one model's scaler with
+    another model's coefficients.
+    """
+
+    def __init__(self, loaded_obj, version, source_path=None, stamp=None):
+        # If pickle contains dict (model + scaler), unpack it
+        if isinstance(loaded_obj, dict):
+            self.model = loaded_obj.get("model")
+            self.scaler = loaded_obj.get("scaler", None)
+            self.probability_grid = loaded_obj.get("probability_grid", None)
+        else:
+            self.model = loaded_obj
+            self.scaler = None
+            self.probability_grid = None
+        self.fast_evaluator = compile_linear_evaluator(self.model, self.scaler)
+        self.version = version
+        self.source_path = source_path
+        self.stamp = stamp
+
+
+_active = None
+_follow_current = True
+_model_generation = 0
+_load_lock = threading.Lock()
+_watcher = None
+_watcher_stop = threading.Event()
+
+
+def _artifact_stamp(path):
+    """(mtime_ns, size) of a model artifact, or None if it is missing."""
+    try:
+        st = os.stat(artifact_stamp_path(path))
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def activate_model(loaded_obj, source_path=None, stamp=None):
+    """
+    Makes a loaded artifact the active model.
+
+    Unpacks a model .pkl dict (model + scaler + optional grid) or a bare
+    estimator, compiles the fast path, swaps it in with a single reference
+    assignment and invalidates cached predictions.
+    """
+    global _active, _model_generation
+
+    # The generation changes on every load, so cache keys never match
+    # entries computed with a previous model even if versions repeat
+    _model_generation += 1
+    artifact_version = loaded_obj.get("version", None) if isinstance(loaded_obj, dict) else None
+    active = ActiveModel(loaded_obj, (artifact_version, _model_generation), source_path, stamp)
+
+    _active = active
+    prediction_cache.clear()
+    return active
+
+
+def resolve_model_path():
+    """The registry's current artifact if one is published, else MODEL_PATH."""
+    return resolve_current(MODEL_REGISTRY_DIR) or MODEL_PATH
+
+
+def load_model(path=None):
+    """
+    Loads a model artifact synchronously and makes it active.
+
+    Args:
+        path: Artifact to load. Defaults to resolve_model_path(), in which
+            case hot reload also follows the registry's CURRENT pointer.
+    """
+    global _follow_current
+    _follow_current = path is None
+    path = path or resolve_model_path()
+    stamp = _artifact_stamp(path)
+    return activate_model(load_artifact(path), path, stamp)
+
+
+def get_active_model():
+    """
+    The active model, loading resolve_model_path() on first use.
+
+    The first load also starts the background watcher that hot-reloads
+    the artifact when it changes on disk or a new version is published.
+    """
+    active = _active
+    if active is None:
+        with _load_lock:
+            if _active is None:
+                load_model()
+                start_model_watcher()
+            active = _active
+    return active
+
+
+def reload_model_if_changed():
+    """
+    Reloads the model if its artifact changed on disk or the registry's
+    CURRENT pointer moved to a new version.
+
+    The new model is fully loaded before it is swapped in; if loading
+    fails (e.g. the file is still being written) the current model stays
+    active and the change is picked up on a later check.
+
+    Returns:
+        bool: True if a new model was activated
+    """
+    active = _active
+    if active is None or active.source_path is None:
+        return False
+
+    path = resolve_model_path() if _follow_current else active.source_path
+    stamp = _artifact_stamp(path)
+    if stamp is None or (path, stamp) == (active.source_path, active.stamp):
+        return False
+
+    try:
+        loaded_obj = load_artifact(path)
+    except Exception as e:
+        print(f"⚠️ Warning: Failed to reload model from {path}: {e}")
+        return False
+
+    with _load_lock:
+        activate_model(loaded_obj, path, stamp)
+    print(f"Reloaded model from {path}")
+    return True
+
+
+def _watch_model(interval):
+    while not _watcher_stop.wait(interval):
+        reload_model_if_changed()
+
+
+def start_model_watcher(interval=RELOAD_INTERVAL):
+    """Starts the background thread that hot-reloads the model artifact."""
+    global _watcher
+    if _watcher is not None and _watcher.is_alive():
+        return
+    _watcher_stop.clear()
+    _watcher = threading.Thread(target=_watch_model, args=(interval,), name="model-watcher", daemon=True)
+    _watcher.start()
+
+
+def stop_model_watcher():
+    """Stops the hot-reload thread, if running."""
+    global _watcher
+    _watcher_stop.set()
+    if _watcher is not None:
+        _watcher.join()
+    _watcher = None
+
+
+def __getattr__(name):
+    # Module-level model attributes resolve lazily to the active model
+    if name in ('model', 'scaler', 'probability_grid', 'fast_evaluator'):
+        return getattr(get_active_model(), name)
+    if name == 'model_version':
+        return get_active_model().version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # -----------------------------
 # Prediction for single student
 # -----------------------------
+@timed(PREDICT_SECONDS, function='predict_placement')
+@_memoized
 def predict_placement(cgpa, iq):
     """
     Predicts placement status based on CGPA and IQ.
@@ -33,15 +384,27 @@ def predict_placement(cgpa, iq):
     Returns:
         tuple: (prediction, probability, key_influence_factor)
     """
-    input_data = pd.DataFrame([[cgpa, iq]], columns=['cgpa', 'iq'])
+    active = get_active_model()
+    model, scaler = active.model, active.scaler
 
-    # Apply scaler if available
-    if scaler is not None:
-        input_data = scaler.transform(input_data)
+    if active.fast_evaluator is not None:
+        # Exact and cheaper than the grid; the grid is for models without one
+        prediction, probability = active.fast_evaluator(float(cgpa), float(iq))
+    elif active.probability_grid is not None and grid_contains(active.probability_grid, cgpa, iq):
+        # Precomputed at save time: array index + interpolation, no model call
+        probability = grid_probability(active.probability_grid, float(cgpa), float(iq))
+        prediction = int(probability > 0.5)
+    else:
+        input_data = pd.DataFrame([[cgpa, iq]], columns=['cgpa', 'iq'])
+
+        # Apply scaler if available
+        if scaler is not None:
+            input_data = scaler.transform(input_data)
 
-    # Make prediction
-    prediction = int(model.predict(input_data)[0])
-    probability = float(model.predict_proba(input_data)[0][1])  # probability of being placed
+        # One predict_proba pass gives both the class and its probability
+        proba = model.predict_proba(input_data)[0]
+        prediction = int(model.classes_[np.argmax(proba)])
+        probability = float(proba[list(model.classes_).index(1)])  # probability of being placed
 
     # Determine key influence factor
     try:
@@ -55,9 +418,82 @@ def predict_placement(cgpa, iq):
     return prediction, probability, key_factor
 
 
+# -----------------------------
+# Batched prediction
+# -----------------------------
+def _predict_arrays(cgpa, iq, active=None):
+    """Predictions and placement probabilities for float64 cgpa/iq arrays."""
+    active = active or get_active_model()
+    grid = active.probability_grid
+    if grid is not None and active.fast_evaluator is None:
+        # Grid lookups for in-domain rows; only the rest go to the model
+        in_grid = grid_contains(grid, cgpa, iq)
+        probabilities = np.empty(len(cgpa), dtype=np.float64)
+        probabilities[in_grid] = grid_probabilities(grid, cgpa[in_grid], iq[in_grid])
+        predictions = (probabilities > 0.5).astype(np.int64)
+        if not in_grid.all():
+            outside = ~in_grid
+            predictions[outside], probabilities[outside] = _predict_model_arrays(
+                cgpa[outside], iq[outside], active
+            )
+        return predictions, probabilities
+    return _predict_model_arrays(cgpa, iq, active)
+
+
+def _predict_model_arrays(cgpa, iq, active):
+    """Model (not grid) predictions and placement probabilities for float64 arrays."""
+    if len(cgpa) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    if active.fast_evaluator is not None:
+        return active.fast_evaluator.batch(cgpa, iq)
+
+    model, scaler = active.model, active.scaler
+    features = pd.DataFrame({'cgpa': cgpa, 'iq': iq})
+    if scaler is not None:
+        features = scaler.transform(features)
+
+    # One predict_proba pass gives both the classes and their probabilities
+    proba = model.predict_proba(features)
+    predictions = np.asarray(model.classes_)[np.argmax(proba, axis=1)].astype(np.int64)
+    probabilities = proba[:, list(model.classes_).index(1)]
+    return predictions, probabilities
+
+
+@timed(PREDICT_SECONDS, function='predict_placement_batch')
+def predict_placement_batch(cgpa_array, iq_array):
+    """
+    Predicts placement status for many students in one pass.
+    
+    Args:
+        cgpa_array (array-like): CGPAs (0-10)
+        iq_array (array-like): IQ scores, same length as cgpa_array
+        
+    Returns:
+        tuple: (predictions, probabilities, key_influence_factors) as numpy arrays
+    """
+    cgpa = np.asarray(cgpa_array, dtype=np.float64)
+    iq = np.asarray(iq_array, dtype=np.float64)
+    if cgpa.shape != iq.shape:
+        raise ValueError("cgpa_array and iq_array must have the same length")
+
+    active = get_active_model()
+    predictions, probabilities = _predict_arrays(cgpa, iq, active)
+
+    # Determine key influence factors (same rule as predict_placement)
+    try:
+        coefficients = active.model.coef_[0]
+        cgpa_is_key = np.abs(coefficients[0] * cgpa) > np.abs(coefficients[1] * iq)
+    except Exception:
+        cgpa_is_key = cgpa > 7.0
+    key_factors = np.where(cgpa_is_key, "CGPA", "IQ")
+
+    return predictions, probabilities, key_factors
+
+
 # -----------------------------
 # Personalized advice
 # -----------------------------
+@_memoized
 def get_placement_advice(cgpa, iq, prediction):
     advice = []
 
@@ -85,31 +521,242 @@ def get_placement_advice(cgpa, iq, prediction):
 # -----------------------------
 # Scenario analysis
 # -----------------------------
+@_memoized
 def analyze_improvement_scenarios(cgpa, iq):
+    improved_cgpa = min(cgpa + 0.5, 10.0)
+    scenarios = {
+        "current": (cgpa, iq),
+        "cgpa_improved": (improved_cgpa, iq),
+        "iq_improved": (cgpa, iq + 10),
+        "both_improved": (improved_cgpa, iq + 10),
+    }
+
+    # Score every variant in a single batched call
+    cgpas, iqs = zip(*scenarios.values())
+    predictions, probabilities, key_factors = predict_placement_batch(cgpas, iqs)
+
     return {
-        "current": predict_placement(cgpa, iq),
-        "cgpa_improved": predict_placement(min(cgpa + 0.5, 10.0), iq),
-        "iq_improved": predict_placement(cgpa, iq + 10),
-        "both_improved": predict_placement(min(cgpa + 0.5, 10.0), iq + 10),
+        name: (int(predictions[i]), float(probabilities[i]), str(key_factors[i]))
+        for i, name in enumerate(scenarios)
     }
 
 
 # -----------------------------
 # Bulk CSV prediction (optional)
 # -----------------------------
-def bulk_predict(file_path):
+@timed(PREDICT_SECONDS, function='bulk_predict')
+def bulk_predict(file_path, output_path=None):
     """
-    Predicts placement outcomes for multiple students in a CSV file.
-    CSV must have columns: cgpa, iq
+    Predicts placement outcomes for multiple students in a dataset file.
+    Accepts a CSV or a columnar dataset directory with columns: cgpa, iq
+    
+    Args:
+        file_path: Input dataset (CSV, columnar or sharded directory)
+        output_path: Optional path to also write the scored dataset to;
+            a path not ending in .csv is written in columnar format
     """
-    df = pd.read_csv(file_path)
+    df = read_dataset(file_path)
 
-    if scaler is not None:
-        features = scaler.transform(df[['cgpa', 'iq']])
-    else:
-        features = df[['cgpa', 'iq']]
+    df["prediction"], df["probability"] = _predict_arrays(
+        df['cgpa'].to_numpy(dtype=np.float64), df['iq'].to_numpy(dtype=np.float64),
+        get_active_model()
+    )
 
-    df["prediction"] = model.predict(features)
-    df["probability"] = model.predict_proba(features)[:, 1]
+    if output_path is not None:
+        write_dataset(df, output_path)
 
+    if metrics.ENABLED:
+        BULK_ROWS.inc(len(df), function='bulk_predict')
     return df
+
+
+# -----------------------------
+# Streaming bulk prediction
+# -----------------------------
+DEFAULT_BULK_CHUNKSIZE = 100_000
+
+
+def iter_bulk_predict(file_path, chunksize=DEFAULT_BULK_CHUNKSIZE):
+    """
+    Yields scored chunks of a dataset file, holding one chunk in memory.
+    
+    Args:
+        file_path: Input dataset (CSV, columnar or sharded directory)
+        chunksize: Rows read and scored per chunk
+    
+    Yields:
+        DataFrame chunks with prediction and probability columns added
+    """
+    # One model for the whole file, even if a reload happens mid-stream
+    active = get_active_model()
+    for chunk in iter_dataset_chunks(file_path, chunksize):
+        chunk["prediction"], chunk["probability"] = _predict_arrays(
+            chunk['cgpa'].to_numpy(dtype=np.float64), chunk['iq'].to_numpy(dtype=np.float64), active
+        )
+        yield chunk
+
+
+@timed(PREDICT_SECONDS, function='bulk_predict_streaming')
+def bulk_predict_streaming(file_path, output_path, chunksize=DEFAULT_BULK_CHUNKSIZE,
+                           progress_callback=None):
+    """
+    Scores a dataset file chunk by chunk, writing results as it goes.
+    
+    Memory stays flat regardless of file size, so this suits multi-GB
+    cohort exports that bulk_predict cannot load in one go.
+    
+    Args:
+        file_path: Input dataset (CSV, columnar or sharded directory)
+        output_path: Where to write the scored rows; a path not ending in
+            .csv is written in columnar format
+        chunksize: Rows read and scored per chunk
+        progress_callback: Optional callable(rows_done, rows_per_sec),
+            called after each chunk is written
+    
+    Returns:
+        dict: rows scored, elapsed seconds and rows/sec
+    """
+    writer = open_dataset_writer(output_path)
+    rows = 0
+    start = time.perf_counter()
+
+    for chunk in iter_bulk_predict(file_path, chunksize):
+        writer.write(chunk)
+        rows += len(chunk)
+        if progress_callback is not None:
+            elapsed = time.perf_counter() - start
+            progress_callback(rows, rows / elapsed if elapsed > 0 else 0.0)
+
+    writer.close()
+    elapsed = time.perf_counter() - start
+    if metrics.ENABLED:
+        BULK_ROWS.inc(rows, function='bulk_predict_streaming')
+
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+# -----------------------------
+# Parallel bulk prediction
+# -----------------------------
+def _init_bulk_worker(model_path):
+    """
+    Process-pool initializer: map the model artifact read-only.
+
+    model_path is an 'mmap' artifact (see model_artifact), evaluated
+    straight from memory-mapped arrays, so workers share one page-cache
+    copy of the model instead of each unpickling a private copy.
+    """
+    activate_model(load_artifact(model_path, mmap=True), model_path, _artifact_stamp(model_path))
+
+
+def _score_bulk_task(task):
+    """Process-pool worker: score one chunk, given as a DataFrame or a columnar row range."""
+    if isinstance(task, tuple):
+        part_path, start, stop = task
+        chunk = read_columnar_slice(part_path, start, stop)
+    else:
+        chunk = task
+    chunk["prediction"], chunk["probability"] = _predict_arrays(
+        chunk['cgpa'].to_numpy(dtype=np.float64), chunk['iq'].to_numpy(dtype=np.float64)
+    )
+    return chunk
+
+
+def _bulk_tasks(file_path, chunksize):
+    """
+    Work items for parallel scoring, in output order.
+
+    Columnar data is handed out as (path, start, stop) ranges that workers
+    read from the memory map themselves; CSV chunks are parsed here and
+    sent over.
+    """
+    parts = list_shard_paths(file_path) if dataset_format(file_path) == 'sharded' else [file_path]
+    for part_path in parts:
+        if is_columnar(part_path):
+            for start in range(0, columnar_rows(part_path), chunksize):
+                yield (part_path, start, start + chunksize)
+        else:
+            yield from iter_dataset_chunks(part_path, chunksize)
+
+
+@timed(PREDICT_SECONDS, function='bulk_predict_parallel')
+def bulk_predict_parallel(file_path, output_path, n_workers=None,
+                          chunksize=DEFAULT_BULK_CHUNKSIZE, progress_callback=None,
+                          model_path=None):
+    """
+    Scores a dataset file across a process pool, writing results in order.
+    
+    Chunks are spread over the workers with a bounded number in flight, so
+    memory stays flat, and results are written in input order. Call from
+    under an ``if __name__ == "__main__":`` guard on platforms that spawn
+    worker processes.
+    
+    Args:
+        file_path: Input dataset (CSV, columnar or sharded directory)
+        output_path: Where to write the scored rows; a path not ending in
+            .csv is written in columnar format
+        n_workers: Worker processes (defaults to the CPU count)
+        chunksize: Rows per work item
+        progress_callback: Optional callable(rows_done, rows_per_sec)
+        model_path: Model artifact the workers map (defaults to the active
+            model's artifact, or resolve_model_path() if none is loaded); a
+            pickle is converted to a temporary 'mmap' artifact first
+    
+    Returns:
+        dict: rows scored, elapsed seconds and rows/sec
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    max_in_flight = 2 * n_workers
+    if model_path is None:
+        # Score with the model this process serves, not a stale default
+        active = _active
+        model_path = (active.source_path if active is not None else None) or resolve_model_path()
+    # Unpickling copies tree node arrays into every worker (sklearn's
+    # Tree.__setstate__), so workers map a temporary 'mmap' copy instead
+    shared_dir = None
+    if not is_mmap_artifact(model_path):
+        shared_dir = tempfile.mkdtemp(prefix='placement-bulk-')
+        shared_path = os.path.join(shared_dir, 'model')
+        save_artifact(load_artifact(model_path, mmap=False), shared_path, 'mmap')
+        model_path = shared_path
+    writer = open_dataset_writer(output_path)
+    rows = 0
+    start = time.perf_counter()
+
+    def write_result(future):
+        nonlocal rows
+        chunk = future.result()
+        writer.write(chunk)
+        rows += len(chunk)
+        if progress_callback is not None:
+            elapsed = time.perf_counter() - start
+            progress_callback(rows, rows / elapsed if elapsed > 0 else 0.0)
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_bulk_worker,
+                                 initargs=(model_path,)) as pool:
+            pending = deque()
+            for task in _bulk_tasks(file_path, chunksize):
+                pending.append(pool.submit(_score_bulk_task, task))
+                if len(pending) >= max_in_flight:
+                    write_result(pending.popleft())
+            while pending:
+                write_result(pending.popleft())
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+    writer.close()
+    elapsed = time.perf_counter() - start
+    if metrics.ENABLED:
+        BULK_ROWS.inc(rows, function='bulk_predict_parallel')
+
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0,
+    }
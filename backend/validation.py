@@ -0,0 +1,269 @@
+# backend/validation.py
+
+"""
+Streaming, row-level validation of incoming placement records.
+
+validate_file reads a dataset chunk by chunk and checks every row's
+types, ranges and label. Valid rows are handed to a callback, e.g.
+ingestion, and rejected rows are written to a side CSV file with the
+reasons they failed, so one bad value no longer discards a whole batch.
+
+Large files are validated in parallel: a CSV is cut into byte ranges on
+line boundaries that worker processes parse and check themselves, and
+columnar data is handed out as row ranges the workers read from the
+memory map. Results come back in file order with a bounded number of
+chunks in flight, so memory stays flat.
+"""
+
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    from backend.dataset_io import (
+        columnar_rows, dataset_format, is_columnar, iter_dataset_chunks, list_shard_paths,
+        read_columnar_slice
+    )
+except ImportError:  # run as a script from inside backend/
+    from dataset_io import (
+        columnar_rows, dataset_format, is_columnar, iter_dataset_chunks, list_shard_paths,
+        read_columnar_slice
+    )
+
+REQUIRED_COLUMNS = ('cgpa', 'iq', 'placement')
+
+# Inclusive valid ranges, as enforced by AutoRetrainer.validate_new_data
+VALUE_RANGES = {
+    'cgpa': (0, 10),
+    'iq': (50, 200),
+}
+LABELS = (0, 1)
+
+REASON_COLUMN = 'reason'
+
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024  # small enough to stay cache-friendly
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Rows converted per attempt when a column was parsed as text
+_CONVERT_BLOCK = 65_536
+
+# Files smaller than this are validated in-process; a pool would cost more than it saves
+MIN_PARALLEL_BYTES = 4 * DEFAULT_CHUNK_BYTES
+
+
+def check_columns(columns):
+    """Raise ValueError if any required column is missing (no row could be valid)."""
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f"New data must contain columns: {set(REQUIRED_COLUMNS)} (missing {missing})")
+
+
+def _to_float(column):
+    """A column as float64, NaN where a value is missing or not a number."""
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype=np.float64)
+    # A text column usually holds a few bad values among numbers: the plain
+    # conversion is several times faster than pd.to_numeric, so only the
+    # blocks it fails on take the slow path
+    values = column.to_numpy()
+    converted = np.empty(len(values), dtype=np.float64)
+    for start in range(0, len(values), _CONVERT_BLOCK):
+        block = values[start:start + _CONVERT_BLOCK]
+        try:
+            converted[start:start + len(block)] = block.astype(np.float64)
+        except (TypeError, ValueError):
+            converted[start:start + len(block)] = pd.to_numeric(
+                pd.Series(block), errors='coerce'
+            ).to_numpy(dtype=np.float64)
+    return converted
+
+
+def validate_chunk(df):
+    """
+    Split a chunk into valid and rejected rows.
+
+    Args:
+        df: DataFrame with at least the required columns, as parsed
+
+    Returns:
+        tuple: (valid rows with numeric cgpa/iq and integer placement,
+        rejected rows as read plus a 'reason' column)
+    """
+    check_columns(df.columns)
+    values = {col: _to_float(df[col]) for col in REQUIRED_COLUMNS}
+
+    # (failing mask, reason) per check; a row can fail several
+    failures = []
+    for col in REQUIRED_COLUMNS:
+        failures.append((np.isnan(values[col]), f"{col} is missing or not a number"))
+    for col, (low, high) in VALUE_RANGES.items():
+        with np.errstate(invalid='ignore'):
+            out_of_range = ~np.isnan(values[col]) & ((values[col] < low) | (values[col] > high))
+        failures.append((out_of_range, f"{col} must be between {low} and {high}"))
+    bad_label = ~np.isnan(values['placement']) & ~np.isin(values['placement'], LABELS)
+    failures.append((bad_label, f"placement must be one of {list(LABELS)}"))
+
+    rejected_mask = np.zeros(len(df), dtype=bool)
+    for mask, _ in failures:
+        rejected_mask |= mask
+
+    keep = ~rejected_mask
+    valid = (df if keep.all() else df[keep]).assign(
+        cgpa=values['cgpa'][keep],
+        iq=values['iq'][keep],
+        placement=values['placement'][keep].astype(np.int64)
+    )
+
+    rejected = df[rejected_mask].copy()
+    if rejected_mask.any():
+        reasons = [[] for _ in range(int(rejected_mask.sum()))]
+        for mask, reason in failures:
+            for i in np.flatnonzero(mask[rejected_mask]):
+                reasons[i].append(reason)
+        rejected[REASON_COLUMN] = ['; '.join(r) for r in reasons]
+    else:
+        rejected[REASON_COLUMN] = pd.Series(dtype=object)
+    return valid.reset_index(drop=True), rejected.reset_index(drop=True)
+
+
+# -----------------------------
+# Work items
+# -----------------------------
+def _csv_byte_ranges(path, chunk_bytes):
+    """(header names, [(start, stop), ...]) with every range ending on a line boundary."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        ranges = []
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()  # finish the line the range ends in
+            stop = f.tell()
+            ranges.append((start, stop))
+            start = stop
+    return pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist(), ranges
+
+
+def _validation_tasks(path, chunk_bytes, chunk_rows):
+    """
+    Work items in file order: ('csv', path, names, start, stop) byte
+    ranges, ('columnar', path, start, stop) row ranges, or DataFrames.
+    """
+    parts = list_shard_paths(path) if dataset_format(path) == 'sharded' else [path]
+    for part_path in parts:
+        if is_columnar(part_path):
+            for start in range(0, columnar_rows(part_path), chunk_rows):
+                yield ('columnar', part_path, start, start + chunk_rows)
+        elif dataset_format(part_path) == 'csv':
+            names, ranges = _csv_byte_ranges(part_path, chunk_bytes)
+            check_columns(names)
+            for start, stop in ranges:
+                yield ('csv', part_path, names, start, stop)
+        else:
+            yield from iter_dataset_chunks(part_path, chunk_rows)
+
+
+def _read_task(task):
+    if isinstance(task, pd.DataFrame):
+        return task
+    if task[0] == 'columnar':
+        _, part_path, start, stop = task
+        return read_columnar_slice(part_path, start, stop)
+    _, part_path, names, start, stop = task
+    with open(part_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    # low_memory=False: a column with a bad value is typed once for the whole range
+    return pd.read_csv(io.BytesIO(data), header=None, names=names, low_memory=False)
+
+
+def _validate_task(task):
+    """Worker: read one work item and validate it."""
+    return validate_chunk(_read_task(task))
+
+
+def validate_file(path, on_valid, rejected_path=None, n_workers=None,
+                  chunk_bytes=DEFAULT_CHUNK_BYTES, chunk_rows=DEFAULT_CHUNK_ROWS,
+                  progress_callback=None):
+    """
+    Validate a dataset file chunk by chunk.
+
+    Call from under an ``if __name__ == "__main__":`` guard on platforms
+    that spawn worker processes.
+
+    Args:
+        path: CSV file, columnar directory or sharded directory
+        on_valid: Called with each chunk of valid rows, in file order
+        rejected_path: CSV file for rejected rows and their reasons
+            (default: <path>.rejected.csv); only created if a row is rejected
+        n_workers: Worker processes (default: the CPU count for large
+            files, in-process for small ones)
+        chunk_bytes: Bytes of CSV per work item
+        chunk_rows: Rows of columnar data per work item
+        progress_callback: Optional callable(rows_done, rows_per_sec)
+
+    Returns:
+        dict: rows, valid_rows, rejected_rows, rejected_path (None if
+        nothing was rejected), seconds and rows_per_sec
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dataset not found: {path}")
+    rejected_path = rejected_path or f"{path.rstrip(os.sep)}.rejected.csv"
+    if n_workers is None:
+        large = os.path.isdir(path) or os.path.getsize(path) >= MIN_PARALLEL_BYTES
+        n_workers = (os.cpu_count() or 1) if large else 1
+
+    stats = {'rows': 0, 'valid_rows': 0, 'rejected_rows': 0}
+    rejected_file = None
+    start = time.perf_counter()
+
+    def handle(result):
+        nonlocal rejected_file
+        valid, rejected = result
+        stats['rows'] += len(valid) + len(rejected)
+        stats['valid_rows'] += len(valid)
+        if len(rejected):
+            if rejected_file is None:
+                rejected_file = open(rejected_path, 'w', newline='')
+                rejected.to_csv(rejected_file, index=False)
+            else:
+                rejected.to_csv(rejected_file, index=False, header=False)
+            stats['rejected_rows'] += len(rejected)
+        if len(valid):
+            on_valid(valid)
+        if progress_callback is not None:
+            elapsed = time.perf_counter() - start
+            progress_callback(stats['rows'], stats['rows'] / elapsed if elapsed > 0 else 0.0)
+
+    try:
+        tasks = _validation_tasks(path, chunk_bytes, chunk_rows)
+        if n_workers <= 1:
+            for task in tasks:
+                handle(_validate_task(task))
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                pending = deque()
+                for task in tasks:
+                    pending.append(pool.submit(_validate_task, task))
+                    if len(pending) >= 2 * n_workers:
+                        handle(pending.popleft().result())
+                while pending:
+                    handle(pending.popleft().result())
+    finally:
+        if rejected_file is not None:
+            rejected_file.close()
+
+    elapsed = time.perf_counter() - start
+    stats.update(
+        rejected_path=rejected_path if stats['rejected_rows'] else None,
+        seconds=elapsed,
+        rows_per_sec=stats['rows'] / elapsed if elapsed > 0 else 0.0
+    )
+    return stats
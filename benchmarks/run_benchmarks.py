@@ -0,0 +1,310 @@
+# benchmarks/run_benchmarks.py
+
+"""
+Performance benchmarks for prediction, bulk scoring, retraining, dataset
+generation and agent routing.
+
+Every benchmark yields named results with a unit and a direction
+(lower or higher is better). Results are compared against a JSON
+baseline and the run fails (exit code 1) when any result is worse than
+the baseline by more than the tolerance.
+
+    python benchmarks/run_benchmarks.py                     # compare to baseline
+    python benchmarks/run_benchmarks.py --update-baseline   # record a new baseline
+    python benchmarks/run_benchmarks.py --quick --only predict bulk
+
+Baselines are machine-specific: record them on the machine that runs
+the comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import types
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+
+# Differences smaller than this are timer noise, whatever the relative change
+NOISE_FLOOR = {'s': 0.01, 'ms': 0.5, 'us': 1.0}
+
+BULK_SIZES = [10_000, 1_000_000]
+QUICK_BULK_SIZES = [10_000]
+
+
+def _result(value, unit, higher_is_better=False):
+    return {'value': float(value), 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def _quiet(func, *args, **kwargs):
+    """Call func with its stdout discarded (the library functions print progress)."""
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.stdout = stdout
+
+
+def _best_of(func, repeats):
+    """Shortest wall time of repeated calls, in seconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _make_dataset(path, n_rows):
+    from backend.generate_dataset import generate_placement_dataset
+    _quiet(generate_placement_dataset, n_rows, save_path=path, return_df=False)
+
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+def bench_predict(quick, workdir):
+    """Single-call predict_placement latency, uncached and cached."""
+    from backend import tools
+
+    calls = 2_000 if quick else 20_000
+    rng = np.random.default_rng(0)
+    inputs = list(zip(np.round(rng.uniform(4, 10, calls), 2), np.round(rng.uniform(70, 160, calls), 1)))
+    tools.get_active_model()  # load outside the timed region
+
+    cache_size = tools.prediction_cache.maxsize
+    tools.set_cache_size(0)
+    try:
+        latencies = []
+        for cgpa, iq in inputs:
+            start = time.perf_counter()
+            tools.predict_placement(cgpa, iq)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        tools.set_cache_size(cache_size)
+
+    tools.predict_placement(7.5, 120.0)
+    hits = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        tools.predict_placement(7.5, 120.0)
+        hits.append(time.perf_counter() - start)
+
+    latencies_us = np.array(latencies) * 1e6
+    return {
+        'predict_placement.p50_us': _result(np.percentile(latencies_us, 50), 'us'),
+        'predict_placement.p99_us': _result(np.percentile(latencies_us, 99), 'us'),
+        'predict_placement.cached_p50_us': _result(np.percentile(np.array(hits) * 1e6, 50), 'us'),
+    }
+
+
+def bench_bulk(quick, workdir):
+    """bulk_predict throughput on CSV input."""
+    from backend import tools
+
+    tools.get_active_model()
+    results = {}
+    for n_rows in (QUICK_BULK_SIZES if quick else BULK_SIZES):
+        path = os.path.join(workdir, f'bulk_{n_rows}.csv')
+        _make_dataset(path, n_rows)
+        seconds = _best_of(lambda: tools.bulk_predict(path), 1 if n_rows >= 1_000_000 else 3)
+        results[f'bulk_predict.{n_rows}.rows_per_sec'] = _result(n_rows / seconds, 'rows/s', True)
+    return results
+
+
+def bench_train(quick, workdir):
+    """AutoRetrainer.train_models wall time per candidate model."""
+    from backend.auto_retrain import AutoRetrainer
+    from backend.dataset_io import read_dataset
+
+    n_rows = 2_000 if quick else 10_000
+    path = os.path.join(workdir, f'train_{n_rows}.csv')
+    _make_dataset(path, n_rows)
+    retrainer = AutoRetrainer(path, os.path.join(workdir, 'model.pkl'),
+                              config_path=os.path.join(workdir, 'training_config.json'))
+    df = read_dataset(path)
+
+    start = time.perf_counter()
+    _, _, all_results = retrainer.train_models(df)
+    total = time.perf_counter() - start
+
+    results = {
+        f'train_models.{name}.seconds': _result(result['train_seconds'], 's')
+        for name, result in all_results.items()
+    }
+    results['train_models.total.seconds'] = _result(total, 's')
+    return results
+
+
+def bench_generate(quick, workdir):
+    """generate_placement_dataset throughput for CSV and columnar output."""
+    n_rows = 200_000 if quick else 2_000_000
+    results = {}
+    for file_format, name in (('csv', 'gen.csv'), ('columnar', 'gen_columnar')):
+        path = os.path.join(workdir, name)
+        seconds = _best_of(lambda: _make_dataset(path, n_rows), 1)
+        results[f'generate_placement_dataset.{file_format}.rows_per_sec'] = _result(
+            n_rows / seconds, 'rows/s', True
+        )
+    return results
+
+
+class _StubLlama:
+    """Stands in for llama_cpp.Llama: no model file, instant canned completion."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, prompt, **kwargs):
+        return {'choices': [{'text': ' Focus on your CGPA and practice aptitude tests.'}]}
+
+
+def bench_agent(quick, workdir):
+    """create_agent routing latency per intent, with a stub LLM."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    # The agent loads its LLM at import time; never load a real model here
+    sys.modules['llama_cpp'] = types.SimpleNamespace(Llama=_StubLlama)
+    from backend import agent
+    agent.llm = _StubLlama()
+
+    rng = np.random.default_rng(0)
+    n = 1_000
+    df = pd.DataFrame({'cgpa': rng.uniform(4, 10, n).round(2), 'iq': rng.uniform(70, 160, n).round(1)})
+    df['Placed'] = np.where(rng.random(n) < 0.5, '✅ Yes', '❌ No')
+
+    intents = {
+        'placement': 'Will I get placement with cgpa 7.5 and iq 120?',
+        'advice': 'How can I improve with cgpa 6.8 and iq 110?',
+        'dataframe': 'Summarize the placement dataset',
+        'plot': 'Show me a scatter plot of CGPA vs IQ',
+        'chat': 'Tell me about interview preparation',
+    }
+    calls = 5 if quick else 20
+    results = {}
+    for intent, question in intents.items():
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            response = agent.create_agent(question, df)
+            latencies.append(time.perf_counter() - start)
+            if response.get('figure') is not None:
+                plt.close(response['figure'])
+        if response['type'] != intent:
+            raise RuntimeError(f"Expected a '{intent}' response, got '{response['type']}'")
+        results[f'create_agent.{intent}.p50_ms'] = _result(np.percentile(np.array(latencies) * 1e3, 50), 'ms')
+    return results
+
+
+BENCHMARKS = {
+    'predict': bench_predict,
+    'bulk': bench_bulk,
+    'train': bench_train,
+    'generate': bench_generate,
+    'agent': bench_agent,
+}
+
+
+# -----------------------------
+# Baselines
+# -----------------------------
+def compare(results, baseline, tolerance):
+    """
+    Results that regressed past the tolerance.
+
+    Returns:
+        list: (name, value, baseline_value, relative_change) for each regression
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]['value']
+        if base == 0:
+            continue
+        change = (result['value'] - base) / base
+        worse = -change if result['higher_is_better'] else change
+        if abs(result['value'] - base) < NOISE_FLOOR.get(result['unit'], 0):
+            continue
+        if worse > tolerance:
+            regressions.append((name, result['value'], base, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument('--quick', action='store_true', help="Smaller inputs; skips the 1M-row bulk run")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument('--update-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative regression (default: 0.25)")
+    parser.add_argument('--output', help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='placement-bench-') as workdir:
+        for name in (args.only or BENCHMARKS):
+            print(f"Running {name}...", flush=True)
+            results.update(BENCHMARKS[name](args.quick, workdir))
+
+    print(f"\n{'benchmark':45} {'value':>14}  unit")
+    print("-" * 70)
+    for name, result in results.items():
+        print(f"{name:45} {result['value']:14.2f}  {result['unit']}")
+
+    report = {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'cpus': os.cpu_count()},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)['results']
+        # Benchmarks that were not run keep their previous baseline
+        baseline.update(results)
+        report['results'] = baseline
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for name, value, base, change in regressions:
+            print(f"  {name}: {value:.2f} vs baseline {base:.2f} ({change:+.1%})")
+        return 1
+
+    print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())